@@ -14,9 +14,88 @@ Action Types:
 """
 
 import numpy as np
-from itertools import product, combinations_with_replacement
+from itertools import product
 from typing import Dict, List, Tuple
-from utility import Utility
+from area import KIND_CARD, KIND_HOUSE
+from jit import njit
+
+
+def pack_tools(combo) -> int:
+    """Pack 7 tool flags [t0, t1, t2, t3, o0, o1, o2] into an int in [0, 127], t0 highest."""
+    key = 0
+    for flag in combo:
+        key = (key << 1) | int(flag)
+    return key
+
+
+# For each packed set of usable tools, a 128-bit int with bit k set when
+# tool combo k only uses tools from that set (i.e. it's a valid choice)
+TOOLS_SUBSET_BITS = [
+    sum(1 << k for k in range(128) if k & ~available == 0)
+    for available in range(128)
+]
+
+# The same sets as arrays of packed combo keys, for _fill_mask_tools
+TOOLS_SUBSET_KEYS = [
+    np.array([k for k in range(128) if k & ~available == 0], dtype=np.int64)
+    for available in range(128)
+]
+
+
+def _tool_choices(available: int) -> Tuple[Tuple[int, ...], ...]:
+    """Valid 7-flag tool combos for a packed usable set, in product() order."""
+    positions = [i for i in range(7) if available >> (6 - i) & 1]
+    choices = []
+    for combo in product([0, 1], repeat=len(positions)):
+        row = [0] * 7
+        for flag, pos in zip(combo, positions):
+            row[pos] = flag
+        choices.append(tuple(row))
+    return tuple(choices)
+
+
+# For each packed set of usable tools, every valid tool choice as 7 flags
+# (the list Game.get_valid_actions_for_tools_choose returns)
+TOOL_CHOICES = [_tool_choices(available) for available in range(128)]
+
+_WORD_MASK = (1 << 64) - 1
+
+
+# ============================================================
+# Mask kernels: pure integer indexing over the dense index tables,
+# compiled with Numba when it's available (see jit.py)
+# ============================================================
+
+@njit(cache=True)
+def _fill_mask_tools(mask, tools_idx, valid_keys):
+    """Set mask bits for packed 7-bit tool combo keys."""
+    for k in range(valid_keys.shape[0]):
+        mask[tools_idx[valid_keys[k]]] = 1
+
+
+@njit(cache=True)
+def fill_resource_mask(mask, resources_idx, w_max, s_max, c_max, g_max,
+                       min_cost, max_cost, variety):
+    """
+    Set mask bits for every affordable way to spend resources.
+    
+    Enumerates (wood, stone, clay, gold) counts up to what the player owns
+    with min_cost <= total <= max_cost. When variety >= 0, exactly that many
+    different resource types must be used.
+    """
+    for w in range(min(w_max, max_cost) + 1):
+        for s in range(min(s_max, max_cost - w) + 1):
+            for c in range(min(c_max, max_cost - w - s) + 1):
+                for g in range(min(g_max, max_cost - w - s - c) + 1):
+                    if w + s + c + g < min_cost:
+                        continue
+                    if variety >= 0:
+                        used = (w > 0) + (s > 0) + (c > 0) + (g > 0)
+                        if used != variety:
+                            continue
+                    i = resources_idx[w, s, c, g]
+                    if i >= 0:
+                        mask[i] = 1
 
 
 class ActionSystem:
@@ -26,12 +105,24 @@ class ActionSystem:
     Provides:
     - ALL_ACTIONS: List of all possible actions
     - action_to_index: Fast lookup from action tuple to index
+    - Dense per-type index tables (-1 marks an action that doesn't exist)
     - get_mask(): Generate binary mask for current valid actions
     
     Attributes:
         ALL_ACTIONS (List): Every possible action as a 7-element list
+        ALL_ACTIONS_ARR (np.ndarray): ALL_ACTIONS as one (NUM_ACTIONS, 7) int8
+                                      array, for zero-copy rows and batched gathers
         NUM_ACTIONS (int): Total number of actions
+        *_START (int), *_SLICE (slice): Where each action type's block starts
+                                        and its full index range
         action_to_index (Dict): Maps action tuples to indices for O(1) lookup
+        _loc_caps (np.ndarray): (num_locations,) most workers placeable per location
+        _loc_min_workers (np.ndarray): (num_locations,) fewest workers per placement
+        _placement_idx (np.ndarray): (num_locations, 11) location/workers -> index
+        _tools_idx (np.ndarray): (128,) packed tool flags (see pack_tools) -> index
+        _resources_idx (np.ndarray): (8, 8, 8, 8) wood/stone/clay/gold -> index
+        _dice_idx (np.ndarray): (7,) die value -> index
+        _choose2_idx (np.ndarray): (7, 7) resource pair -> index
     """
     
     def __init__(self, locations: List):
@@ -43,6 +134,7 @@ class ActionSystem:
         """
         self.locations = locations
         self.ALL_ACTIONS = []
+        self.ALL_ACTIONS_ARR = np.empty((0, 7), dtype=np.int8)
         self.action_to_index = {}
         
         self._build_all_actions()
@@ -51,35 +143,48 @@ class ActionSystem:
         """Build complete action list with dictionary lookups."""
         actions = []
         action_to_index = {}
+
+        # Dense lookup tables, filled alongside the dict
+        self._placement_idx = np.full((len(self.locations), 11), -1, dtype=np.int32)
+        self._tools_idx = np.full(128, -1, dtype=np.int32)
+        self._resources_idx = np.full((8, 8, 8, 8), -1, dtype=np.int32)
+        self._dice_idx = np.full(7, -1, dtype=np.int32)
+        self._choose2_idx = np.full((7, 7), -1, dtype=np.int32)
         
         # ============================================================
         # PLACEMENT ACTIONS: (1, location_idx, worker_count)
         # Output format: [location, workers, 0, 0, 0, 0, 0]
         # ============================================================
         self.PLACEMENT_START = len(actions)
+
+        # The House always takes exactly 2 workers, everything else
+        # 1..capacity (capped at 10 workers)
+        is_house = [location.kind_code == KIND_HOUSE for location in self.locations]
+        self._loc_caps = np.array([2 if house else min(location.capacity, 10)
+                                   for house, location in zip(is_house, self.locations)],
+                                  dtype=np.int8)
+        self._loc_min_workers = np.where(is_house, 2, 1).astype(np.int8)
         
-        for loc_idx, location in enumerate(self.locations):
-            if not(isinstance(location, Utility) and location.name() == "House"):
-                max_workers = min(location.capacity, 10)  # Cap at 10 workers
-                for workers in range(1, max_workers + 1):
-                    key = (1, loc_idx, workers)
-                    action_to_index[key] = len(actions)
-                    actions.append([loc_idx, workers, 0, 0, 0, 0, 0])
-            else:
-                key = (1, loc_idx, 2)
+        for loc_idx in range(len(self.locations)):
+            for workers in range(int(self._loc_min_workers[loc_idx]),
+                                 int(self._loc_caps[loc_idx]) + 1):
+                key = (1, loc_idx, workers)
                 action_to_index[key] = len(actions)
-                actions.append([loc_idx, 2, 0, 0, 0, 0, 0])
+                self._placement_idx[loc_idx, workers] = len(actions)
+                actions.append([loc_idx, workers, 0, 0, 0, 0, 0])
         
         # ============================================================
         # TOOL ACTIONS: (2, t0, t1, t2, t3, o0, o1, o2)
         # Output format: [t0, t1, t2, t3, o0, o1, o2] (binary flags)
+        # Packed key k has t0 as its highest bit, so index = TOOLS_START + k
         # ============================================================
         self.TOOLS_START = len(actions)
         
-        for combo in product([0, 1], repeat=7):
-            key = (2,) + combo
-            action_to_index[key] = len(actions)
-            actions.append(list(combo))
+        for k in range(128):
+            bits = [(k >> (6 - i)) & 1 for i in range(7)]
+            action_to_index[(2,) + tuple(bits)] = len(actions)
+            self._tools_idx[k] = len(actions)
+            actions.append(bits)
         
         # ============================================================
         # BUY/SKIP ACTIONS: (3, choice)
@@ -101,15 +206,22 @@ class ActionSystem:
         # ============================================================
         self.RESOURCES_START = len(actions)
         
-        for cost in range(1, 8):  # 1 to 7 resources
-            for combo in combinations_with_replacement([3, 4, 5, 6], cost):
-                counts = [combo.count(r) for r in [3, 4, 5, 6]]
-                key = (4, counts[0], counts[1], counts[2], counts[3])
-                
-                # Avoid duplicates (same resource counts can come from different combos)
-                if key not in action_to_index:
-                    action_to_index[key] = len(actions)
-                    actions.append(counts + [0, 0, 0])
+        # Every (wood, stone, clay, gold) count with 1-7 resources in total.
+        # Counts are unique by construction, so no dedup is needed.
+        counts = np.indices((8, 8, 8, 8)).reshape(4, -1).T
+        sums = counts.sum(axis=1)
+        keep = (sums >= 1) & (sums <= 7)
+        counts, sums = counts[keep], sums[keep]
+        # Same order the old combinations_with_replacement loop produced
+        # (by total, then most wood/stone/clay first) so saved models still
+        # map their outputs to the same actions
+        order = np.lexsort((-counts[:, 2], -counts[:, 1], -counts[:, 0], sums))
+        
+        for w, st, c, g in counts[order].tolist():
+            key = (4, w, st, c, g)
+            action_to_index[key] = len(actions)
+            self._resources_idx[w, st, c, g] = len(actions)
+            actions.append([w, st, c, g, 0, 0, 0])
         
         # ============================================================
         # DICE SELECTION: (5, die_value)
@@ -120,6 +232,7 @@ class ActionSystem:
         for die_value in range(1, 7):  # 1 to 6
             key = (5, die_value)
             action_to_index[key] = len(actions)
+            self._dice_idx[die_value] = len(actions)
             actions.append([die_value, 0, 0, 0, 0, 0, 0])
         
         # ============================================================
@@ -131,14 +244,29 @@ class ActionSystem:
         for combo in product(range(2, 7), repeat=2):  # 2-6 for each
             key = (6, combo[0], combo[1])
             action_to_index[key] = len(actions)
+            self._choose2_idx[combo] = len(actions)
             actions.append([combo[0], combo[1], 0, 0, 0, 0, 0])
         
         # ============================================================
         # Store results
         # ============================================================
+        # Keys are unique by construction (nothing is deduplicated above), so
+        # every key must map to its own action
+        assert len(action_to_index) == len(actions), "duplicate action keys"
+
         self.ALL_ACTIONS = actions
+        self.ALL_ACTIONS_ARR = np.asarray(actions, dtype=np.int8)
+        self.ALL_ACTIONS_ARR.flags.writeable = False
         self.action_to_index = action_to_index
         self.NUM_ACTIONS = len(actions)
+
+        # Index range of each section, for bulk slice reads/writes
+        self.PLACEMENT_SLICE = slice(self.PLACEMENT_START, self.TOOLS_START)
+        self.TOOLS_SLICE = slice(self.TOOLS_START, self.BUY_SKIP_START)
+        self.BUY_SKIP_SLICE = slice(self.BUY_SKIP_START, self.RESOURCES_START)
+        self.RESOURCES_SLICE = slice(self.RESOURCES_START, self.DICE_START)
+        self.DICE_SLICE = slice(self.DICE_START, self.CHOOSE2_START)
+        self.CHOOSE2_SLICE = slice(self.CHOOSE2_START, self.NUM_ACTIONS)
         
         # Print summary
         """
@@ -152,9 +280,9 @@ class ActionSystem:
         print(f"  TOTAL:     {self.NUM_ACTIONS} actions")
         """
     
-    def get_action(self, index: int) -> List[int]:
-        """Get action list by index."""
-        return self.ALL_ACTIONS[index]
+    def get_action(self, index: int) -> np.ndarray:
+        """Get action by index (a read-only view into ALL_ACTIONS_ARR)."""
+        return self.ALL_ACTIONS_ARR[index]
     
     def get_index(self, action_type: int, *args) -> int:
         """
@@ -166,6 +294,9 @@ class ActionSystem:
         
         Returns:
             int: Index into ALL_ACTIONS
+
+        Raises:
+            KeyError: If the action doesn't exist in the action space.
         
         Examples:
             get_index(1, 3, 2)        # Place 2 workers at location 3
@@ -175,83 +306,190 @@ class ActionSystem:
             get_index(5, 4)           # Select die value 4
             get_index(6, 3, 5)        # Choose wood and clay
         """
-        key = (action_type,) + tuple(args)
-        return self.action_to_index[key]
+        try:
+            if action_type == 1:
+                index = self._placement_idx[args[0], args[1]]
+            elif action_type == 2:
+                index = self._tools_idx[pack_tools(args)] if len(args) == 7 else -1
+            elif action_type == 3:
+                index = self.BUY_SKIP_START + args[0] if args[0] in (0, 1) else -1
+            elif action_type == 4:
+                index = self._resources_idx[tuple(args)]
+            elif action_type == 5:
+                index = self._dice_idx[args[0]]
+            elif action_type == 6:
+                index = self._choose2_idx[args[0], args[1]]
+            else:
+                index = -1
+        except IndexError:
+            index = -1
+
+        if index < 0:
+            raise KeyError((action_type,) + tuple(args))
+        return int(index)
 
 
 class MaskGenerator:
     """
     Generates action masks for the current game state.
     
-    Uses dictionary lookups for O(1) per valid action instead of
-    O(n) searching through the action list.
+    Uses the action system's dense index tables for O(1) per valid action
+    instead of O(n) searching through the action list.
     """
     
     def __init__(self, action_system: ActionSystem):
         self.action_system = action_system
+        # Reused output buffer, so a step doesn't allocate a fresh mask
+        self._mask_buf = np.zeros(action_system.NUM_ACTIONS, dtype=np.int8)
+        # Read-only view of the buffer handed out by get_mask(copy=False),
+        # so callers can't corrupt the cached mask
+        self._mask_view = self._mask_buf.view()
+        self._mask_view.flags.writeable = False
+        # Game.state_version the buffer was filled for (None: never filled)
+        self._mask_version = None
+
+        # Packed form: action i is bit (i & 63) of word (i >> 6)
+        self.NUM_MASK_WORDS = (action_system.NUM_ACTIONS + 63) // 64
+        self._pack_buf = np.zeros(self.NUM_MASK_WORDS * 64, dtype=np.int8)
+        # Where the 128 tool actions start in the packed mask
+        self._tools_word, self._tools_bit = divmod(action_system.TOOLS_START, 64)
+
+        # Precomputed indices for the buy/skip branch
+        self._skip_idx = action_system.get_index(3, 0)
+        self._buy_idx = action_system.get_index(3, 1)
+
+        # Worker counts 0-10, the columns of ActionSystem._placement_idx
+        self._worker_counts = np.arange(action_system._placement_idx.shape[1])
+
+        # Mask filler per action type (game.current_type_of_action), so
+        # get_mask is one indexed call instead of an if/elif chain
+        self._fillers = (self._fill_none, self._fill_placement, self._fill_tools,
+                         self._fill_buy, self._fill_spend, self._fill_dice,
+                         self._fill_choose2, self._fill_none)
     
-    def get_mask(self, game) -> np.ndarray:
+    # ===== Per-action-type mask fillers (see _fillers) =====
+
+    def _fill_none(self, game, mask: np.ndarray) -> None:
+        """Action types without choices (0, 7): nothing is valid."""
+
+    def _fill_placement(self, game, mask: np.ndarray) -> None:
+        """Type 1: place workers at a location."""
+        # _placement_idx is -1 outside each location's min..cap workers,
+        # so only the per-location limit needs checking
+        within = self._worker_counts <= game.placement_limits()[:, None]
+        idxs = self.action_system._placement_idx[within]
+        mask[idxs[idxs >= 0]] = 1
+
+    def _fill_tools(self, game, mask: np.ndarray) -> None:
+        """Type 2: choose which tools to use."""
+        _fill_mask_tools(mask, self.action_system._tools_idx,
+                         TOOLS_SUBSET_KEYS[game.get_available_tools_key()])
+
+    def _fill_buy(self, game, mask: np.ndarray) -> None:
+        """Type 3: buy or skip the current card/building."""
+        mask[self._skip_idx] = 1  # Skip always valid
+        location = game.locations[game.current_action_data[0]]
+        player = game.current_player
+        if location.kind_code == KIND_CARD:
+            # Cards only need the player's running non-food total
+            can_buy = location.is_able_to_buy(player.non_food_total)
+        else:
+            can_buy = location.is_able_to_buy(player.resources)
+        if can_buy:
+            mask[self._buy_idx] = 1
+
+    def _fill_spend(self, game, mask: np.ndarray) -> None:
+        """Type 4: choose which resources to spend."""
+        # Enumerate straight from the player's resources, without
+        # building the list of valid payments
+        min_cost, max_cost, variety = game.get_spending_constraints()
+        resources = game.current_player.resources
+        fill_resource_mask(mask, self.action_system._resources_idx,
+                           resources[3], resources[4], resources[5], resources[6],
+                           min_cost, max_cost, variety)
+
+    def _fill_dice(self, game, mask: np.ndarray) -> None:
+        """Type 5: select a die from the rolled dice."""
+        if game.current_action_data:
+            mask[self.action_system._dice_idx[game.current_action_data]] = 1
+
+    def _fill_choose2(self, game, mask: np.ndarray) -> None:
+        """Type 6: pick 2 resources; all combinations are valid."""
+        mask[self.action_system.CHOOSE2_SLICE] = 1
+
+    def get_mask(self, game, copy: bool = False) -> np.ndarray:
         """
         Generate binary mask for currently valid actions.
         
+        The mask is written into a buffer owned by the generator, so it is
+        only valid until the next call. Without copy=True a read-only view
+        of that buffer is returned: repeated calls for the same
+        game.state_version return it without recomputing. Pass copy=True
+        to keep or modify the mask.
+        
         Args:
             game: Game instance with current_type_of_action and helper methods
+            copy: Return a writable copy instead of the shared read-only
+                view (default: False)
         
         Returns:
             np.ndarray: Binary mask of shape (NUM_ACTIONS,)
         """
-        mask = np.zeros(self.action_system.NUM_ACTIONS, dtype=np.int8)
-        idx = self.action_system.action_to_index
-        
-        action_type = game.current_type_of_action
-        
-        if action_type == 1:  # Placement
-            valid = game.get_valid_actions_for_placement()
-            for loc_idx, workers in valid:
-                key = (1, loc_idx, workers)
-                if key in idx:
-                    mask[idx[key]] = 1
-        
-        elif action_type == 2:  # Tools
-            valid = game.get_valid_actions_for_tools_choose()
-            for tool_combo in valid:
-                key = (2,) + tuple(tool_combo)
-                if key in idx:
-                    mask[idx[key]] = 1
-        
-        elif action_type == 3:  # Buy/skip
-            mask[idx[(3, 0)]] = 1  # Skip always valid
-            if game.locations[game.current_action_data[0]].is_able_to_buy(game.current_player.resources):
-                mask[idx[(3, 1)]] = 1
-        
-        elif action_type == 4:  # Resource spending
-            valid = game.get_valid_actions_for_spending_resources()
-            for resource_combo in valid:
-                # resource_combo is [wood, stone, clay, gold]
-                if len(resource_combo) == 4:
-                    key = (4, resource_combo[0], resource_combo[1], 
-                           resource_combo[2], resource_combo[3])
-                    if key in idx:
-                        mask[idx[key]] = 1
+        mask = self._mask_buf
+        if game.state_version != self._mask_version:
+            mask.fill(0)
+            self._fillers[game.current_type_of_action](game, mask)
+            self._mask_version = game.state_version
+        return mask.copy() if copy else self._mask_view
+
+    def get_mask_bits(self, game) -> np.ndarray:
+        """
+        Generate the valid-action mask packed into 64-bit words.
         
-        elif action_type == 5:  # Dice selection
-            for die_value in game.current_action_data:
-                key = (5, die_value)
-                if key in idx:
-                    mask[idx[key]] = 1
+        Action i is valid when bit (i & 63) of word (i >> 6) is set. This
+        is 8x smaller than the int8 mask, which matters when masks are
+        stored or shipped to the trainer in bulk.
         
-        elif action_type == 6:  # Choose 2 resources
-            # All combinations valid
-            for i in range(self.action_system.CHOOSE2_START, 
-                          self.action_system.NUM_ACTIONS):
-                mask[i] = 1
+        Args:
+            game: Game instance with current_type_of_action and helper methods
         
-        return mask
-    
+        Returns:
+            np.ndarray: uint64 array of shape (NUM_MASK_WORDS,)
+        """
+        if game.current_type_of_action == 2:  # Tools
+            # The valid combos are a precomputed 128-bit set; shift it into
+            # place and store the (at most 3) words it covers
+            bits = np.zeros(self.NUM_MASK_WORDS, dtype=np.uint64)
+            tools_bits = TOOLS_SUBSET_BITS[game.get_available_tools_key()] << self._tools_bit
+            for word in range(self._tools_word, min(self._tools_word + 3, self.NUM_MASK_WORDS)):
+                bits[word] = tools_bits & _WORD_MASK
+                tools_bits >>= 64
+            return bits
+
+        n = self.action_system.NUM_ACTIONS
+        self._pack_buf[:n] = self.get_mask(game)
+        return np.packbits(self._pack_buf, bitorder='little').view('<u8')
+
     def get_random_valid_action(self, game) -> int:
-        """Get a random valid action index."""
-        mask = self.get_mask(game)
-        valid_indices = np.where(mask == 1)[0]
-        if len(valid_indices) == 0:
+        """
+        Get a random valid action index.
+        
+        Picks uniformly among the set bits of the packed mask: count the
+        set bits, draw r, then skip whole words by popcount and clear the
+        lowest r bits of the word that holds the pick. No index array of
+        all valid actions is built.
+        """
+        words = self.get_mask_bits(game).tolist()
+        counts = [word.bit_count() for word in words]
+        total = sum(counts)
+        if total == 0:
             raise ValueError("No valid actions available!")
-        return np.random.choice(valid_indices)
\ No newline at end of file
+
+        r = np.random.randint(total)
+        for word_idx, count in enumerate(counts):
+            if r < count:
+                word = words[word_idx]
+                for _ in range(r):
+                    word &= word - 1  # Drop the lowest set bit
+                return (word_idx << 6) + (word & -word).bit_length() - 1
+            r -= count
\ No newline at end of file
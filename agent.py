@@ -13,15 +13,16 @@ import torch
 import random
 import os
 import numpy as np
-from game import Game
-from collections import deque
-from model import Linear_QNet, QTrainer
+from game import Game, STATE_SIZE
+from model import Linear_QNet, QTrainer, device
 from helper import plot
+from jit import warmup
 
 # Configuration constants for training
 MAX_MEMORY = 1000000  # Maximum size of experience replay buffer
 BATCH_SIZE = 2048    # Number of experiences sampled per training batch
 LR = 0.001          # Learning rate for the neural network optimizer
+STATE_DIM = STATE_SIZE  # Length of the vector returned by Game.get_state()
 
 
 class Agent:
@@ -38,8 +39,11 @@ class Agent:
                         to shift from exploration to exploitation.
         gamma (float): Discount factor for future rewards (0-1).
                       Controls how much future rewards matter.
-        memory (deque): Experience replay buffer storing (state, action, reward,
-                       next_state, done) tuples. Limited to MAX_MEMORY size.
+        _states, _actions, _rewards, _next_states, _dones (np.ndarray):
+                       Experience replay buffer stored as one preallocated
+                       array per field (a ring buffer of MAX_MEMORY entries).
+        _pos (int): Next slot to write in the replay buffer.
+        _size (int): Number of experiences currently stored.
         model: Neural network model for Q-value prediction (to be implemented).
         trainer: Training utility class for updating the model (to be implemented).
     """
@@ -56,10 +60,19 @@ class Agent:
         self.gamma = 0.9  # Discount factor for future rewards - TODO: set to appropriate value (e.g., 0.9)
         
         # Experience replay buffer: stores transitions (s, a, r, s', done)
-        # When full, oldest experiences are automatically removed
-        self.memory = deque(maxlen=MAX_MEMORY)
+        # as one array per field. When full, the oldest experiences get
+        # overwritten. np.empty only reserves the memory; pages are touched
+        # as the buffer fills up.
+        self._states = np.empty((MAX_MEMORY, STATE_DIM), dtype=np.float32)
+        self._actions = np.empty(MAX_MEMORY, dtype=np.int32)
+        self._rewards = np.empty(MAX_MEMORY, dtype=np.float32)
+        self._next_states = np.empty_like(self._states)
+        self._dones = np.empty(MAX_MEMORY, dtype=np.bool_)
+        self._pos = 0
+        self._size = 0
+        self._rng = np.random.default_rng()
         
-        self.model = Linear_QNet(147, 512, num_actions)      # TODO: Initialize neural network model (e.g., DQN network)
+        self.model = Linear_QNet(STATE_DIM, 512, num_actions)      # TODO: Initialize neural network model (e.g., DQN network)
 
         model_path = './model/model.pth'
         if os.path.exists(model_path):
@@ -69,6 +82,11 @@ class Agent:
         self.trainer = QTrainer(self.model, lr=LR, gamma=self.gamma)
         self.trainer = QTrainer(self.model, lr=LR, gamma = self.gamma)    # TODO: Initialize trainer class for optimization
 
+        # Pinned staging buffer for the inference state, so the copy to the
+        # GPU can run asynchronously. Not needed when running on the CPU.
+        self._state_buf = (torch.empty(STATE_DIM, dtype=torch.float32, pin_memory=True)
+                           if device.type == 'cuda' else None)
+
     def get_state(self, game: Game) -> np.ndarray:
         """
         Extract and return the current game state as a neural network-compatible array.
@@ -81,10 +99,12 @@ class Agent:
             game (Game): The current game instance to extract state from.
         
         Returns:
-            np.ndarray: A 1D array of floats representing the game state,
+            np.ndarray: A 1D float32 array representing the game state,
                        ready for neural network input.
         """
-        return game.get_state()
+        # float32 matches the network weights and the replay buffer, so
+        # torch.from_numpy can share the memory. No copy if already float32.
+        return game.get_state().astype(np.float32, copy=False)
 
     def remember(self, state: np.ndarray, action: int, reward: float, 
                  next_state: np.ndarray, done: bool) -> None:
@@ -101,7 +121,15 @@ class Agent:
             next_state (np.ndarray): The resulting state after the action.
             done (bool): Whether the game ended after this action.
         """
-        self.memory.append((state, action, reward, next_state, done))
+        pos = self._pos
+        self._states[pos] = state
+        self._actions[pos] = action
+        self._rewards[pos] = reward
+        self._next_states[pos] = next_state
+        self._dones[pos] = done
+
+        self._pos = (pos + 1) % MAX_MEMORY
+        self._size = min(self._size + 1, MAX_MEMORY)
 
     def train_long_memory(self) -> None:
         """
@@ -113,19 +141,23 @@ class Agent:
         
         The batch size is controlled by BATCH_SIZE constant.
         """
+        if self._size == 0:
+            return
+
         # Only train if we have enough experiences
-        if len(self.memory) > BATCH_SIZE:
+        if self._size > BATCH_SIZE:
             # Sample a random batch to decorrelate experiences
-            mini_sample = random.sample(self.memory, BATCH_SIZE)
+            # (with replacement: one vectorized RNG call, standard for DQN)
+            idx = self._rng.integers(0, self._size, size=BATCH_SIZE)
         else:
             # If memory is small, use all available experiences
-            mini_sample = self.memory
+            idx = np.arange(self._size)
 
-        # Unpack the batch into separate tuples for each component
-        states, actions, rewards, next_states, dones = zip(*mini_sample)
-        
+        # Gather each field of the batch with one fancy index
         # Pass batch to trainer for one training step
-        self.trainer.train_step(states, actions, rewards, next_states, dones)
+        self.trainer.train_step(self._states[idx], self._actions[idx],
+                                self._rewards[idx], self._next_states[idx],
+                                self._dones[idx])
 
     def train_short_memory(self, state: np.ndarray, action: int, reward: float,
                           next_state: np.ndarray, done: bool) -> None:
@@ -160,7 +192,6 @@ class Agent:
         Returns:
             np.ndarray: The action vector (size 8 for 8 possible moves).
         """
-        from model import device
         # Decrease epsilon over games - more exploration early, more exploitation later
         self.epsilon = max(10, 100 - self.n_games/5)  # Always keep some exploration
         
@@ -173,10 +204,16 @@ class Agent:
             final_move = game.mask_generator.get_random_valid_action(game)
         else:
             # Exploitation: use network to predict best move
-            state0 = torch.tensor(state, dtype=torch.float).to(device)
-            prediction = self.model(state0)
+            # Share the numpy buffer instead of copying element by element
+            state0 = torch.from_numpy(np.asarray(state, dtype=np.float32))
+            if self._state_buf is not None:
+                self._state_buf.copy_(state0)
+                state0 = self._state_buf.to(device, non_blocking=True)
+            with torch.no_grad():
+                prediction = self.model(state0)
 
-            mask = torch.tensor(game.get_mask(), dtype=torch.bool).to(device)
+            # from_numpy needs a writable array, and the cached mask is read-only
+            mask = torch.from_numpy(game.get_mask(copy=True)).to(device).bool()
             prediction[~mask] = float('-inf')
 
             final_move = torch.argmax(prediction).item()
@@ -207,14 +244,19 @@ def train() -> None:
     total_vp = 0           # Cumulative vp across all games
     record = -10000               # Best vp achieved so far
     
+    # Load the Numba kernels before the first step (no-op without Numba)
+    warmup()
+
     # Initialize agent and game
     game = Game()
     game.reset()
     agent = Agent(num_actions=game.action_system.NUM_ACTIONS)
     
     # Main training loop
+    # Each step's resulting state is the next step's starting state, so the
+    # state is only extracted once per step (plus once after each reset)
+    state_old = agent.get_state(game)
     while True:
-        state_old = agent.get_state(game)
         current_player = game.current_player_idx  # Save BEFORE play_step
 
         final_move = agent.get_action(state_old, game)
@@ -227,6 +269,8 @@ def train() -> None:
             agent.train_short_memory(state_old, final_move, reward, state_new, done)
             agent.remember(state_old, final_move, reward, state_new, done)
 
+        state_old = state_new
+
         if done:
             
             p0_vp = game.players[0].get_vp()
@@ -234,6 +278,7 @@ def train() -> None:
             print(f"P0 end: food={p0.resources[2]}, wheat={p0.wheat}, workers={p0.total_workers}, vp={p0.get_vp()}")
 
             game.reset()
+            state_old = agent.get_state(game)
             agent.n_games += 1
             agent.train_long_memory()
 
@@ -244,7 +289,7 @@ def train() -> None:
                 f"workers={p0.total_workers}, vp={p0.get_vp()}, "
                 f"buildings={p0.building_num}, cards={cards_owned}, "
                 f"tools={sum(t[0] for t in p0.tools)}, "
-                f"multipliers={list(p0.multipliers.values())}")
+                f"multipliers={p0.multipliers[1:]}")
 
             if p0_vp > record:
                 record = p0_vp
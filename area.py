@@ -8,9 +8,30 @@ where players can place workers to gather resources or purchase items.
 Classes:
     Area: Abstract base class for all board locations.
     Gathering: Concrete area for resource gathering (wood, stone, clay, gold).
+    NullLocation: Always-empty placeholder for an empty board slot
+                  (the NULL_LOCATION singleton).
+    BoardState: Capacities and occupancy of many areas as parallel arrays.
 """
 
 from abc import ABC, abstractmethod
+from typing import Dict, Iterable
+
+import numpy as np
+
+from jit import njit, NUMBA_AVAILABLE
+
+# Number of players that can place workers in an area
+MAX_PLAYERS = 4
+
+# Location kind codes (Area.kind_code), for dispatching on an int instead of
+# isinstance checks and name compares. Utilities first, purchasables last.
+KIND_FARM = 0
+KIND_HOUSE = 1
+KIND_TOOLSHOP = 2
+KIND_GATHERING = 3
+KIND_CARD = 4
+KIND_FLEX_BUILDING = 5
+KIND_CERTAIN_BUILDING = 6
 
 
 class Area(ABC):
@@ -23,9 +44,16 @@ class Area(ABC):
     
     Attributes:
         capacity (int): Maximum number of workers that can be placed in this area.
-        occupants (dict[int, int]): Maps player index (0-3) to worker count placed
-                                   by that player in this area.
+        occupants (np.ndarray): Worker count placed by each player (index 0-3).
+        _total (int): Running total of workers in this area, kept in sync
+                      by place(), remove() and clear().
+        kind_code (int): KIND_* code of the concrete location type.
     """
+
+    # Fixed attribute layout: no per-instance __dict__
+    __slots__ = ("capacity", "occupants", "_total")
+
+    kind_code = -1
     
     def __init__(self, capacity: int):
         """
@@ -34,34 +62,44 @@ class Area(ABC):
         Args:
             capacity (int): Maximum number of workers allowed in this area.
         
-        Initializes occupants dictionary with 0 workers for each of 4 players.
+        Initializes occupants with 0 workers for each of 4 players.
         """
         self.capacity = capacity
         # Track workers placed by each player (players indexed 0-3)
-        self.occupants: dict[int, int] = {
-            0: 0,  # Player 0 workers
-            1: 0,  # Player 1 workers
-            2: 0,  # Player 2 workers
-            3: 0   # Player 3 workers
-        }
+        self.occupants = np.zeros(MAX_PLAYERS, dtype=np.int16)
+        self._total = 0
 
     def place(self, player_index: int, count: int = 1) -> bool:
         """
         Place workers for a player in this area.
         
         Increases the count of workers belonging to the specified player
-        in this area. Note: This method assumes capacity checks are done
-        by the caller via can_place().
+        in this area, unless that would exceed the area's capacity.
         
         Args:
             player_index (int): Index of the player (0-3).
             count (int): Number of workers to place (default: 1).
         
         Returns:
-            bool: Currently not used (returns None). Should return True if
-                 placement succeeded, False otherwise.
+            bool: True if placement succeeded, False if it would exceed capacity.
+        """
+        if self._total + count > self.capacity:
+            return False
+        self.occupants[player_index] += count
+        self._total += count
+        return True
+
+    def remove(self, player_index: int) -> None:
+        """
+        Take all of a player's workers back from this area.
+        
+        Called once the player's workers here have been resolved.
+        
+        Args:
+            player_index (int): Index of the player (0-3).
         """
-        self.occupants[player_index] = self.occupants.get(player_index, 0) + count
+        self._total -= int(self.occupants[player_index])
+        self.occupants[player_index] = 0
 
     @abstractmethod
     def name(self) -> str:
@@ -82,15 +120,16 @@ class Area(ABC):
         
         Called at the start of each round to reset occupancy.
         After clearing, all players will have 0 workers here.
+        The occupants array is zeroed in place, and not at all when the
+        area is already empty.
         """
-        self.occupants.clear()
-        # Reinitialize with zeros for all players
-        for i in range(4):
-            self.occupants[i] = 0
+        if self._total:
+            self.occupants.fill(0)
+            self._total = 0
 
     def is_empty(self) -> bool:
-        return not any(value > 0 for value in self.occupants.values())
-    
+        return self._total == 0
+
     def is_occupied(self, player_index: int) -> bool:
         """
         Check if a specific player has workers in this area.
@@ -101,13 +140,13 @@ class Area(ABC):
         Returns:
             bool: True if player has at least 1 worker here, False otherwise.
         """
-        return self.occupants.get(player_index, 0) > 0
+        return bool(self.occupants[player_index] > 0)
     
     def can_place(self, try_to_place: int = 1) -> bool:
         """
         Check if workers can be placed in this area without exceeding capacity.
         
-        Calculates the total current occupancy and checks if adding try_to_place
+        Uses the running occupancy total and checks if adding try_to_place
         workers would exceed the area's capacity.
         
         Args:
@@ -116,13 +155,7 @@ class Area(ABC):
         Returns:
             bool: True if placement is possible, False if it would exceed capacity.
         """
-        # Sum all workers currently in the area (from all players)
-        current_occupancy = sum(v for v in self.occupants.values())
-        
-        # Check if adding more would exceed capacity
-        if current_occupancy + try_to_place <= self.capacity:
-            return True
-        return False
+        return self._total + try_to_place <= self.capacity
     
     def available_space(self) -> int:
         """
@@ -133,8 +166,7 @@ class Area(ABC):
         Returns:
             int: Number of available worker slots (capacity - current_occupancy).
         """
-        current_occupancy = sum(v for v in self.occupants.values())
-        return self.capacity - current_occupancy
+        return self.capacity - self._total
     
     def is_able_to_buy(self) -> bool:
         """
@@ -164,8 +196,12 @@ class Gathering(Area):
     Attributes:
         resource_type (str): Type of resource gathered here (e.g., "wood", "stone").
         capacity (int): Maximum workers allowed (inherited from Area).
-        occupants (dict[int, int]): Worker placement by player (inherited from Area).
+        occupants (np.ndarray): Worker placement by player (inherited from Area).
     """
+
+    __slots__ = ("resource_type", "_name")
+
+    kind_code = KIND_GATHERING
     
     def __init__(self, capacity: int, resource_type: str) -> None:
         """
@@ -178,6 +214,7 @@ class Gathering(Area):
                                 but this parameter suggests string usage.
         """
         self.resource_type = resource_type
+        self._name = f"can collect {self.resource_type}"
         super().__init__(capacity)
 
     def name(self) -> str:
@@ -188,4 +225,152 @@ class Gathering(Area):
             str: Description indicating this is a resource gathering area
             and which resource can be collected.
         """
-        return f"can collect {self.resource_type}"
\ No newline at end of file
+        return self._name
+
+
+class NullLocation(Area):
+    """
+    Placeholder for a board slot whose card or building was taken.
+    
+    Has no capacity and never holds workers, so loops over the board can
+    call clear()/can_place() on every slot without checking
+    for None. Use the NULL_LOCATION singleton; its occupants array is
+    read-only and it is never registered with a BoardState.
+    """
+
+    __slots__ = ()
+
+    def __init__(self) -> None:
+        super().__init__(0)
+        self.occupants.setflags(write=False)
+
+    def name(self) -> str:
+        """
+        Return a descriptive name for the empty slot.
+        
+        Returns:
+            str: "empty".
+        """
+        return "empty"
+
+    def is_able_to_buy(self, *args) -> bool:
+        """
+        Nothing to buy in an empty slot.
+        
+        Returns:
+            bool: Always False.
+        """
+        return False
+
+
+NULL_LOCATION = NullLocation()
+
+
+@njit(cache=True)
+def _gather_rows(out, occ, rows):
+    """Copy occ[rows] into the flat out array, row after row, without a temporary."""
+    width = occ.shape[1]
+    for i in range(rows.shape[0]):
+        row = rows[i]
+        for p in range(width):
+            out[i * width + p] = occ[row, p]
+
+
+class BoardState:
+    """
+    Struct-of-arrays storage for the occupancy of a set of areas.
+    
+    Every registered area gets a row; its occupants array is rebound to a
+    view of that row, so Area.place/remove/clear write straight into the
+    shared (N, 4) table and whole-board queries become single numpy ops.
+    Rows belong to area objects, not board slots: the game maps its slots
+    to rows and passes that mapping to the batched queries. The last row
+    is a permanently empty sentinel (capacity 0) for empty slots.
+    
+    Attributes:
+        capacity (np.ndarray): (N + 1,) capacity per row.
+        occ (np.ndarray): (N + 1, 4) workers per row and player.
+        EMPTY_ROW (int): Index of the sentinel row.
+        _row (Dict[int, int]): id(area) -> row index.
+    """
+
+    __slots__ = ("capacity", "occ", "EMPTY_ROW", "_row")
+
+    def __init__(self, areas: Iterable[Area]) -> None:
+        """
+        Allocate rows for the given areas and turn their occupants into views.
+        
+        Args:
+            areas (Iterable[Area]): Every area that can appear on the board.
+                                    Duplicates are registered once.
+        """
+        unique = list({id(area): area for area in areas}.values())
+        n = len(unique)
+        self.capacity = np.zeros(n + 1, dtype=np.int16)
+        self.occ = np.zeros((n + 1, MAX_PLAYERS), dtype=np.int16)
+        self.EMPTY_ROW = n
+        self._row: Dict[int, int] = {}
+
+        for row, area in enumerate(unique):
+            self._row[id(area)] = row
+            self.capacity[row] = area.capacity
+            self.occ[row] = area.occupants
+            area.occupants = self.occ[row]
+
+    def row_of(self, area) -> int:
+        """
+        Get the row of a registered area (EMPTY_ROW for an empty slot).
+        
+        Args:
+            area (Area | None): A registered area, or None/NULL_LOCATION
+                                for an empty slot.
+        
+        Returns:
+            int: Row index into capacity/occ.
+        """
+        if area is None or area is NULL_LOCATION:
+            return self.EMPTY_ROW
+        return self._row[id(area)]
+
+    def occupancy_into(self, out: np.ndarray, rows: np.ndarray) -> None:
+        """
+        Write the occupancy of the given rows, flattened, into out.
+        
+        Same values as occ[rows].ravel(), but written in place (e.g.
+        into a state vector) by a Numba kernel when available.
+        
+        Args:
+            out (np.ndarray): (len(rows) * 4,) destination, any numeric dtype.
+            rows (np.ndarray): Row per board slot.
+        """
+        if NUMBA_AVAILABLE:
+            _gather_rows(out, self.occ, rows)
+        else:
+            out[:] = self.occ[rows].ravel()
+
+    def available_space(self, rows: np.ndarray) -> np.ndarray:
+        """
+        Free worker slots of the given rows, all at once.
+        
+        Args:
+            rows (np.ndarray): Row per board slot.
+        
+        Returns:
+            np.ndarray: (len(rows),) capacity minus current occupancy.
+        """
+        return self.capacity[rows] - self.occ[rows].sum(axis=1)
+
+    def occupied_by(self, rows: np.ndarray, player_index: int) -> np.ndarray:
+        """
+        Area.is_occupied for the given rows, all at once.
+        
+        The sentinel row never holds workers, so empty slots come out False.
+        
+        Args:
+            rows (np.ndarray): Row per board slot.
+            player_index (int): Index of the player (0-3).
+        
+        Returns:
+            np.ndarray: (len(rows),) bool, True where the player has workers.
+        """
+        return self.occ[rows, player_index] > 0
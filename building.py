@@ -15,9 +15,75 @@ Classes:
     FlexBuilding: Building with flexible resource requirements.
 """
 
-from typing import Dict, Optional
+from collections import Counter
+from typing import Callable, Dict, List, Optional
 from abc import ABC, abstractmethod
-from area import Area
+
+import numpy as np
+
+from area import Area, KIND_CERTAIN_BUILDING, KIND_FLEX_BUILDING
+
+
+def _make_requirement_check(required: Dict[int, int]) -> Callable[[List[int]], bool]:
+    """
+    Build an affordability check specialized to one fixed requirement.
+    
+    The (type, count) pairs are bound into a closure, so the check is a
+    couple of indexed loads and compares with no loop. Buildings require at
+    most 3 resource types; longer requirements fall back to a generic loop.
+    
+    Args:
+        required (Dict[int, int]): Quantity needed per resource type.
+    
+    Returns:
+        Callable: Function taking the player's resources, returning bool.
+    """
+    items = tuple(required.items())
+    if len(items) == 1:
+        (r0, c0), = items
+        return lambda pr: pr[r0] >= c0
+    if len(items) == 2:
+        (r0, c0), (r1, c1) = items
+        return lambda pr: pr[r0] >= c0 and pr[r1] >= c1
+    if len(items) == 3:
+        (r0, c0), (r1, c1), (r2, c2) = items
+        return lambda pr: pr[r0] >= c0 and pr[r1] >= c1 and pr[r2] >= c2
+    return lambda pr: all(pr[r] >= c for r, c in items)
+
+
+def _make_flex_check(need: int, top: int) -> Callable[[List[int]], bool]:
+    """
+    Build an affordability check specialized to one flexible requirement.
+    
+    The requirement is fixed per building, so the "7 = any resource" case
+    and the variety branch are resolved here, once, instead of on every
+    call. Only variety 2 and 3 still need the non-food counts sorted.
+    
+    Args:
+        need (int): Resources needed (7 meaning "any 1 resource").
+        top (int): How many of the largest non-food counts are used (1-4).
+    
+    Returns:
+        Callable: Function taking the player's resources, returning bool.
+    """
+    if need == 7:
+        return lambda pr: pr[3] > 0 or pr[4] > 0 or pr[5] > 0 or pr[6] > 0
+    if top == 1:
+        # The largest count must cover everything (and be non-zero)
+        need = max(need, 1)
+        return lambda pr: max(pr[3], pr[4], pr[5], pr[6]) >= need
+    if top == 2:
+        def check(pr):
+            _, _, b, a = sorted(pr[3:7])
+            return b > 0 and a + b >= need
+        return check
+    if top == 3:
+        def check(pr):
+            _, c, b, a = sorted(pr[3:7])
+            return c > 0 and a + b + c >= need
+        return check
+    return lambda pr: (pr[3] > 0 and pr[4] > 0 and pr[5] > 0 and pr[6] > 0
+                       and pr[3] + pr[4] + pr[5] + pr[6] >= need)
 
 
 class Building(Area):
@@ -32,8 +98,12 @@ class Building(Area):
     
     Attributes:
         capacity (int): Always 1 (only one player can own each building).
-        occupants (dict[int, int]): Tracks which player owns this building.
+        occupants (np.ndarray): Tracks which player owns this building.
+        _state_tuple (np.ndarray): The building's 3 state vector features
+                                   as float32, set by the subclass.
     """
+
+    __slots__ = ("_state_tuple",)
     
     def __init__(self) -> None:
         """
@@ -45,7 +115,7 @@ class Building(Area):
         super().__init__(1)  # Buildings always have capacity of 1
     
     @abstractmethod
-    def is_able_to_buy(self, player_resources: Dict[int, int]) -> bool:
+    def is_able_to_buy(self, player_resources: List[int]) -> bool:
         """
         Check if a player has enough resources to purchase this building.
         
@@ -53,9 +123,8 @@ class Building(Area):
         as different building types have different purchase requirements.
         
         Args:
-            player_resources (Dict[int, int]): Player's current resources.
-                                              Keys are resource types (2-6),
-                                              values are quantities.
+            player_resources (List[int]): Player's current resources,
+                                          indexed by resource type (2-6).
         
         Returns:
             bool: True if player can afford this building, False otherwise.
@@ -75,7 +144,15 @@ class CertainBuilding(Building):
         resources (list[int]): List of required resource types/amounts.
                               Each element is a resource type (2-6) and
                               the position/count indicates quantity needed.
+        vp (int): VP the building is worth, sum(resources).
+        _required (Counter): Quantity needed per resource type, counted
+                             once from resources.
+        _check (Callable): is_able_to_buy specialized to this requirement.
     """
+
+    __slots__ = ("resources", "vp", "_required", "_check", "_name")
+
+    kind_code = KIND_CERTAIN_BUILDING
     
     def __init__(self, resources: list[int]) -> None:
         """
@@ -88,8 +165,15 @@ class CertainBuilding(Building):
         """
         super().__init__()
         self.resources = resources
+        # Resource types double as their VP value
+        self.vp = sum(resources)
+        # Requirements are fixed, so count them once here
+        self._required = Counter(resources)
+        self._check = _make_requirement_check(self._required)
+        self._name = f"Normal Building {self.resources}"
+        self._state_tuple = np.array(resources, dtype=np.float32)
 
-    def is_able_to_buy(self, player_resources: Dict[int, int]) -> bool:
+    def is_able_to_buy(self, player_resources: List[int]) -> bool:
         """
         Check if a player has all required resources for this building.
         
@@ -98,25 +182,13 @@ class CertainBuilding(Building):
         type is required multiple times (e.g., [6, 6, 3] needs 2x resource 6).
         
         Args:
-            player_resources (Dict[int, int]): Player's resource inventory.
-                                              Keys are resource types (2-6).
+            player_resources (List[int]): Player's resource inventory,
+                                          indexed by resource type (2-6).
         
         Returns:
             bool: True if player has all required resources, False otherwise.
         """
-        # Count how many of each resource type is needed
-        resource_count = {}
-        
-        for resource in self.resources:
-            # Get player's current count of this resource minus what we've
-            # already allocated for this purchase
-            if player_resources.get(resource, 0) - resource_count.get(resource, 0) - 1 < 0:
-                # Player doesn't have enough of this resource
-                return False
-            # Track that we're using one of this resource
-            resource_count[resource] = resource_count.get(resource, 0) + 1
-        
-        return True
+        return self._check(player_resources)
     
     def name(self) -> str:
         """
@@ -125,7 +197,7 @@ class CertainBuilding(Building):
         Returns:
             str: Description including building type and required resources.
         """
-        return f"Normal Building {self.resources}"
+        return self._name
 
 
 class FlexBuilding(Building):
@@ -141,7 +213,14 @@ class FlexBuilding(Building):
         resources_require_count (int): Total number of resource units needed.
         variety (int | None): Maximum number of different resource types allowed.
                              None means no limit on variety.
+        _variety (int): How many of the 4 non-food counts are checked
+                        (variety, or all 4 when unlimited).
+        _check (Callable): is_able_to_buy specialized to this requirement.
     """
+
+    __slots__ = ("resources_require_count", "variety", "_variety", "_check", "_name")
+
+    kind_code = KIND_FLEX_BUILDING
     
     def __init__(self, resources_require_count: int, variety: Optional[int] = None) -> None:
         """
@@ -156,8 +235,13 @@ class FlexBuilding(Building):
         super().__init__()
         self.resources_require_count = resources_require_count
         self.variety = variety
+        self._variety = min(variety, 4) if variety is not None else 4
+        self._check = _make_flex_check(resources_require_count, self._variety)
+        self._name = f"Building that needs {self.resources_require_count} resources of {self.variety} different types"
+        # An unlimited variety (None) encodes as NaN, as it always has
+        self._state_tuple = np.array((resources_require_count, variety, 0), dtype=np.float32)
 
-    def is_able_to_buy(self, player_resources: Dict[int, int]) -> bool:
+    def is_able_to_buy(self, player_resources: List[int]) -> bool:
         """
         Check if player has sufficient resources within variety constraints.
         
@@ -166,33 +250,17 @@ class FlexBuilding(Building):
         Special case: if resources_require_count == 7, any single resource
         with quantity > 0 is sufficient.
         
-        Algorithm:
-        1. If requirement is 7 (special), check if any resource exists
-        2. Otherwise, sort resources by quantity (descending)
-        3. Take top 'variety' resources and sum them
-        4. Verify sum meets requirement AND all selected resources exist
+        The player needs the top 'variety' non-food counts to all be
+        non-zero and to add up to the requirement.
         
         Args:
-            player_resources (Dict[int, int]): Player's resource inventory.
+            player_resources (List[int]): Player's resource inventory,
+                                          indexed by resource type (2-6).
         
         Returns:
             bool: True if player can afford this building, False otherwise.
         """
-        # Special case: requirement of 7 means "any 1 resource of any type"
-        if self.resources_require_count == 7:
-            return any(v > 0 for key, v in player_resources.items() if key != 2)
-        
-        # Get the resource counts, sorted in descending order (most abundant first)
-        counts = sorted((v for key,v in player_resources.items() if key != 2), reverse= True)
-        
-        # Sum the top 'variety' counts
-        # If variety is None or more than available resources, take all
-        total = sum(counts[:self.variety])
-        
-        # Check: have enough total AND all selected resources must exist (>0)
-        # The second condition ensures we don't count zeros in our total
-        return (total >= self.resources_require_count and 
-                all(v > 0 for v in counts[:self.variety]))
+        return self._check(player_resources)
 
     def name(self) -> str:
         """
@@ -201,4 +269,4 @@ class FlexBuilding(Building):
         Returns:
             str: Description of required resource amount and variety.
         """
-        return f"Building that needs {self.resources_require_count} resources of {self.variety} different types"
\ No newline at end of file
+        return self._name
\ No newline at end of file
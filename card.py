@@ -12,21 +12,41 @@ Classes:
     Card: Purchasable card with immediate and end-game effects.
 """
 
-from typing import Dict, Any, List
-from area import Area
-
-# Mapping of card type names to numeric identifiers
-# Used for state representation (neural network input)
-CARD_TYPE_NUMBERS = {
-    "add_resource": 1,           # Gain resources
-    "dice_roll": 2,              # Roll dice and choose reward
-    "resources_with_dice": 3,    # Get resources based on dice roll
-    "add_vp": 4,                 # Immediate victory points
-    "add_tool": 5,               # Gain a tool
-    "add_wheat": 6,              # Gain wheat
-    "draw_card": 7,              # Draw another card
-    "one_use_tool": 8,           # Gain a single-use tool
-    "any_2_resources": 9         # Choose 2 resources
+from typing import Callable, Dict, Any, List
+
+import numpy as np
+
+from area import Area, KIND_CARD, MAX_PLAYERS
+from card_types import CardType, CARD_TYPE_NAMES
+
+
+def _no_effect(card: "Card") -> tuple[int, ...]:
+    """Card types without immediate effect parameters."""
+    return ()
+
+
+# Immediate effect parameters by numeric ID, built from the card's fields
+# (a field left at 0 takes the default shown):
+# - add_resource: (resource_type=2, amount=1)
+# - resources_with_dice: (resource_type=2,)
+# - one_use_tool: (tool_value=1,)
+# - add_vp: (vp=3,)
+# Every other type (and index 0) has no parameters.
+_EFFECT_BUILDERS: Dict[int, Callable[["Card"], tuple[int, ...]]] = {
+    CardType.add_resource: lambda card: (card.resource_type or 2, card.amount or 1),
+    CardType.resources_with_dice: lambda card: (card.resource_type or 2,),
+    CardType.one_use_tool: lambda card: (card.tool_value or 1,),
+    CardType.add_vp: lambda card: (card.vp or 3,),
+}
+EFFECT_BUILDERS = tuple(_EFFECT_BUILDERS.get(i, _no_effect)
+                        for i in range(len(CARD_TYPE_NAMES)))
+
+# Data fields each card type uses, in the order the state vector lists them
+DATA_FIELDS: Dict[int, tuple[str, ...]] = {
+    CardType.add_resource: ("resource_type", "amount"),
+    CardType.resources_with_dice: ("resource_type",),
+    CardType.add_vp: ("vp",),
+    CardType.one_use_tool: ("tool_value",),
 }
 
 
@@ -42,75 +62,117 @@ class Card(Area):
     
     Attributes:
         cost (int): Resource cost to purchase this card.
-        card_id (int): Numeric ID of the card type (from CARD_TYPE_NUMBERS).
-        card_type (str): String identifier of card type (e.g., "add_resource").
-        data (Dict[str, int]): Card-specific data (resource types, amounts, etc.).
+        card_id (int): Numeric ID of the card type (a CardType value).
+        card_type_num (int): Same ID, under the name used for the neural
+                             network input (a plain attribute, no lookup).
+        card_type (str): String identifier of card type (e.g., "add_resource"),
+                         derived from card_id.
+        resource_type (int): Resource the card gives (add_resource,
+                             resources_with_dice), 0 if unused.
+        amount (int): How many of it (add_resource), 0 if unused.
+        tool_value (int): Value of the one-use tool (one_use_tool), 0 if unused.
+        vp (int): Victory points (add_vp), 0 if unused.
+        data_values (tuple[int, int]): The fields this card type uses (see
+                                       DATA_FIELDS), zero-padded to 2.
         painting (int): End-game scoring value based on collections.
         multiplier (int): Multiplier for end-game scoring calculations.
+        _immediate (tuple[int, ...]): Immediate effect, built once from the
+                                      fields by EFFECT_BUILDERS.
+        _end_game (int): End-game effect, resolved once from painting/multiplier.
+        _state_tuple (np.ndarray): This card's 5 state vector features
+                                   [card_type_num, cost, painting, d0, d1]
+                                   as float32, kept in sync with cost.
     """
+
+    __slots__ = ("_cost", "_state_tuple", "card_id", "card_type_num", "resource_type", "amount",
+                 "tool_value", "vp", "data_values", "painting", "multiplier",
+                 "_immediate", "_end_game", "_name")
+
+    kind_code = KIND_CARD
     
-    def __init__(self, card_type: str, cost: int, data: Dict[str, int] = None, 
+    def __init__(self, card_type: CardType, cost: int, resource_type: int = 0,
+                 amount: int = 0, tool_value: int = 0, vp: int = 0,
                  painting: int = None, multiplier: str = None) -> None:
         """
         Initialize a Card with type, cost, and effects.
         
         Args:
-            card_type (str): Type of card (key from CARD_TYPE_NUMBERS).
-                            Must be one of: add_resource, dice_roll, 
-                            resources_with_dice, add_vp, add_tool, add_wheat,
-                            draw_card, one_use_tool, any_2_resources.
+            card_type (CardType): Type of card. One of: add_resource,
+                            dice_roll, resources_with_dice, add_vp, add_tool,
+                            add_wheat, draw_card, one_use_tool, any_2_resources.
             cost (int): Resource cost to purchase this card.
-            data (Dict[str, int], optional): Card-specific data. Contents depend
-                                            on card_type. Defaults to None.
+            resource_type (int, optional): Resource given. Defaults to 0.
+            amount (int, optional): Amount of it given. Defaults to 0.
+            tool_value (int, optional): One-use tool value. Defaults to 0.
+            vp (int, optional): Victory points given. Defaults to 0.
             painting (int, optional): End-game victory point value. Defaults to None.
             multiplier (int, optional): Multiplier for end-game scoring. 
                                        Defaults to None.
         """
-        super().__init__(1)  # Cards have capacity 1 (one owner per card)
-        self.cost = cost
-        self.card_id = CARD_TYPE_NUMBERS[card_type]
-        self.card_type = card_type
-        self.data = data if data is not None else {}
+        # Area.__init__(1) inlined: cards have capacity 1 (one owner per card)
+        self.capacity = 1
+        self.occupants = np.zeros(MAX_PLAYERS, dtype=np.int16)
+        self._total = 0
+        # Only the numeric ID is stored; the name is looked up from it
+        self.card_id = self.card_type_num = int(card_type)
+        self.resource_type = resource_type
+        self.amount = amount
+        self.tool_value = tool_value
+        self.vp = vp
         self.painting = painting
         self.multiplier = multiplier
-    
+        # Type, data and scoring never change, so resolve the effects once
+        fields = DATA_FIELDS.get(self.card_id, ())
+        data = {field: getattr(self, field) for field in fields}
+        self.data_values = (tuple(data.values()) + (0, 0))[:2]
+        self._immediate = EFFECT_BUILDERS[self.card_id](self)
+        self._end_game = painting if painting is not None else multiplier
+        self._name = f"{self.card_type} {data} {self._end_game}"
+        self._state_tuple = np.array((self.card_id, cost, painting or 0) + self.data_values,
+                                     dtype=np.float32)
+        self._cost = cost
+
     @property
-    def card_type_num(self) -> int:
+    def cost(self) -> int:
         """
-        Get the numeric representation of the card type.
+        Get the resource cost to purchase this card.
         
-        Used for neural network input representation, since networks work
-        better with numeric inputs than strings.
+        Returns:
+            int: Current cost (the display sets it by board position).
+        """
+        return self._cost
+
+    @cost.setter
+    def cost(self, value: int) -> None:
+        """
+        Set the cost, updating the precomputed state features with it.
+        
+        Args:
+            value (int): New cost.
+        """
+        self._cost = value
+        self._state_tuple[1] = value
+    
+    @property
+    def card_type(self) -> str:
+        """
+        Get the string identifier of the card type.
         
         Returns:
-            int: Numeric ID for this card type (1-9), or 0 if type is unknown.
+            str: Card type name (CardType member name).
         """
-        return CARD_TYPE_NUMBERS.get(self.card_type, 0)
+        return CARD_TYPE_NAMES[self.card_id]
 
-    def immediate_effect(self) -> list[int]:
+    def immediate_effect(self) -> tuple[int, ...]:
         """
         Return the immediate effect triggered when this card is purchased.
         
-        Different card types have different immediate effects:
-        - add_resource: Return [resource_type, amount]
-        - resources_with_dice: Return [resource_type]
-        - one_use_tool: Return [tool_value]
-        - add_vp: Return [vp_amount]
+        Precomputed at construction (see EFFECT_BUILDERS).
         
         Returns:
-            list[int]: Effect parameters as integers. Contents depend on card_type.
-        """
-        if self.card_type == "add_resource":
-            return [self.data.get("resources", 2), self.data.get("amount", 1)]
-        elif self.card_type == "resources_with_dice":
-            return [self.data.get("resource_type", 2)]
-        elif self.card_type == "one_use_tool":
-            return [self.data.get("tool_value", 1)]
-        elif self.card_type == "add_vp":
-            return [self.data.get("add_vp", 3)]
-        
-        # Unknown card type or card with no immediate effect
-        return []
+            tuple[int, ...]: Effect parameters as integers. Contents depend on card_type.
+        """
+        return self._immediate
 
     def end_game_effect(self) -> int:
         """
@@ -123,7 +185,7 @@ class Card(Area):
         Returns:
             int: Victory points from this card at game end (or 0 if None).
         """
-        return self.painting if self.painting is not None else self.multiplier
+        return self._end_game
     
     def name(self) -> str:
         """
@@ -132,25 +194,21 @@ class Card(Area):
         Returns:
             str: String description including card type, data, and end-game value.
         """
-        return f"{self.card_type} {self.data} {self.end_game_effect()}"
+        return self._name
     
-    def is_able_to_buy(self, player_resources: Dict[int, int]) -> bool:
+    def is_able_to_buy(self, total_non_food: int) -> bool:
         """
         Check if a player has enough resources to purchase this card.
         
-        A player can buy a card if their total resources are at least equal
-        to the card's cost. This is simpler than buildings, which require
-        specific resource types.
+        A player can buy a card if their total non-food resources are at least
+        equal to the card's cost. This is simpler than buildings, which require
+        specific resource types, so it only needs the player's running total.
         
         Args:
-            player_resources (Dict[int, int]): Player's resource inventory.
-            Keys are resource types (2-6).
+            total_non_food (int): Player's wood + stone + clay + gold
+                                  (Player.non_food_total).
         
         Returns:
             bool: True if player has >= cost resources total, False otherwise.
         """
-        # Sum all resources the player has
-        total_resources = sum(v for key,v in player_resources.items() if key != 2)
-        
-        # Can buy if total >= cost
-        return self.cost <= total_resources
\ No newline at end of file
+        return self.cost <= total_non_food
\ No newline at end of file
@@ -0,0 +1,33 @@
+"""
+Card type identifiers for Stone Age civilization cards.
+
+Kept in its own module so the card definitions (card.py), the deck
+(decks.py) and the game share one canonical set of type numbers.
+
+Classes:
+    CardType: Numeric identifiers of the card types.
+"""
+
+from enum import IntEnum
+
+
+class CardType(IntEnum):
+    """
+    Card types and their numeric identifiers.
+    
+    The values are used for state representation (neural network input)
+    and are plain ints, so they can be compared and passed to Numba as such.
+    """
+    add_resource = 1             # Gain resources
+    dice_roll = 2                # Roll dice and choose reward
+    resources_with_dice = 3      # Get resources based on dice roll
+    add_vp = 4                   # Immediate victory points
+    add_tool = 5                 # Gain a tool
+    add_wheat = 6                # Gain wheat
+    draw_card = 7                # Draw another card
+    one_use_tool = 8             # Gain a single-use tool
+    any_2_resources = 9          # Choose 2 resources
+
+
+# Card type name by numeric ID (index 0 unused)
+CARD_TYPE_NAMES = ("",) + tuple(t.name for t in CardType)
@@ -21,93 +21,257 @@ Usage:
     buildings_in_deck = create_building_decks()
 """
 
-import random
-from card import Card
+from typing import Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from card import Card, DATA_FIELDS
+from card_types import CardType
 from building import CertainBuilding, FlexBuilding
 
+# Deck shuffling RNG (PCG64), shared by every deck this module creates
+_rng = np.random.default_rng()
 
-def create_card_deck(shuffle: bool = True) -> list[Card]:
+
+class CardDeck:
     """
-    Create the official Stone Age 36 civilization card deck.
+    Civilization card draw pile.
     
-    Card costs are 1-4 based on position (rightmost=1, leftmost=4).
-    
-    Args:
-        shuffle: Whether to shuffle the deck (default True)
+    Holds the Card objects in draw order plus their printed costs as a
+    numpy column, so reset() can restore them after the display has
+    overwritten Card.cost. Drawing advances a head index; nothing is
+    shifted or reallocated.
     
-            1: 0,      # VP per tool value
-            2: 0,  # VP per building owned
-            3: 0,    # VP per worker
-            4: 0,      # VP per wheat
-    Returns:
-        List of 36 Card objects
+    Attributes:
+        cards (List[Card]): All cards of the deck, in draw order.
+        costs (np.ndarray): (N,) int8 printed cost.
+        _head (int): Index of the next card to draw.
     """
-    cards = [
-        # === DICE ROLL CARDS (10 cards) ===
-        # Each player picks a die: 1=wood, 2=brick/clay, 3=stone, 4=gold, 5=tool, 6=wheat
-        Card("dice_roll", cost=0, multiplier=32),   # pottery
-        Card("dice_roll", cost=0, multiplier=21),   # 1 hut builder  
-        Card("dice_roll", cost=0, multiplier=22),   # 2 hut builders
-        Card("dice_roll", cost=0, multiplier=41),   # writing
-        Card("dice_roll", cost=0, multiplier=42),   # 2 tool makers
-        Card("dice_roll", cost=0, painting=1),   # 1 farmer
-        Card("dice_roll", cost=0, painting=8),   # 2 farmers
-        Card("dice_roll", cost=0, painting=2),   # time
-        Card("dice_roll", cost=0, painting=3),   # transport
-        #Card("dice_roll", cost=0, painting=2),   # medicine
+
+    __slots__ = ("cards", "costs", "_head")
+
+    @classmethod
+    def from_spec(cls, spec: Sequence[Sequence[int]]) -> "CardDeck":
+        """
+        Build a deck from rows of (type_num, cost, data0, data1, multiplier,
+        painting), 0 meaning "none".
         
-        # === FOOD CARDS (7 cards) ===
-        Card("add_resource", cost=1, data={"resources": 2, "amount": 7}, painting=2),   # 7 food
-        Card("add_resource", cost=1, data={"resources": 2, "amount": 2}, multiplier=22),   # 2 food
-        Card("add_resource", cost=2, data={"resources": 2, "amount": 4}, multiplier=21),   # 4 food
-        Card("add_resource", cost=2, data={"resources": 2, "amount": 5}, painting=4),   # 5 food
-        Card("add_resource", cost=3, data={"resources": 2, "amount": 3}, painting=5),   # 3 food
-        Card("add_resource", cost=3, data={"resources": 2, "amount": 1}, painting=5),   # 1 food
-        Card("add_resource", cost=4, data={"resources": 2, "amount": 3}, multiplier=42),   # 3 food
+        Args:
+            spec (Sequence[Sequence[int]]): One row per card, in draw order.
         
-        # === RESOURCE CARDS (5 cards) ===
-        Card("add_resource", cost=1, data={"resources": 4, "amount": 1}, multiplier=41),   # 1 stone
-        Card("add_resource", cost=2, data={"resources": 4, "amount": 2}, painting=1),   # 2 stones
-        Card("add_resource", cost=2, data={"resources": 4, "amount": 1}, multiplier=31),   # 1 stone
-        Card("add_resource", cost=3, data={"resources": 6, "amount": 1}, multiplier=31),   # 1 gold
-        Card("add_resource", cost=3, data={"resources": 5, "amount": 1}, multiplier=32),   # 1 brick
+        Returns:
+            CardDeck: The deck, unshuffled.
+        """
+        deck = cls.__new__(cls)
+        deck.cards = [Card(type_num, cost, painting=painting or None,
+                           multiplier=multiplier or None,
+                           **dict(zip(DATA_FIELDS.get(type_num, ()), (d0, d1))))
+                      for type_num, cost, d0, d1, multiplier, painting in spec]
+        deck.costs = np.array([row[1] for row in spec], dtype=np.int8)
+        deck._head = 0
+        return deck
+
+    def __len__(self) -> int:
+        """Number of cards left to draw."""
+        return len(self.cards) - self._head
+
+    def __iter__(self) -> Iterator[Card]:
+        """Iterate over the cards left to draw, in draw order."""
+        return iter(self.cards[self._head:])
+
+    def draw(self) -> Optional[Card]:
+        """
+        Take the next card off the deck.
         
-        # === RESOURCES WITH DICE (3 cards) ===
-        Card("resources_with_dice", cost=2, data={"resource_type": 6}, painting=6),     # gold
-        Card("resources_with_dice", cost=3, data={"resource_type": 3}, multiplier=32),     # wood
-        Card("resources_with_dice", cost=3, data={"resource_type": 4}, multiplier=31),     # stone
+        Returns:
+            Card: The drawn card, or None if the deck is empty.
+        """
+        head = self._head
+        if head >= len(self.cards):
+            return None
+        self._head = head + 1
+        return self.cards[head]
+
+    def shuffle(self, rng: np.random.Generator) -> None:
+        """
+        Shuffle the whole deck and put every card back on the draw pile.
         
-        # === VICTORY POINTS (3 cards) ===
-        Card("add_vp", cost=2, data={"vp": 3}, multiplier=23),   # 3 VP
-        Card("add_vp", cost=3, data={"vp": 3}, painting=7),   # 3 VP
-        Card("add_vp", cost=4, data={"vp": 3}, painting=7),   # 3 VP
+        One permutation drawn in C reorders the cards and their costs.
         
-        # === TOOL CARD (1 card) ===
-        Card("add_tool", cost=2, painting=6),   # +1 tool
+        Args:
+            rng (np.random.Generator): Source of the permutation.
+        """
+        perm = rng.permutation(len(self.cards))
+        self.cards = [self.cards[i] for i in perm.tolist()]
+        self.costs = self.costs[perm]
+        self._head = 0
+
+    def reset(self) -> None:
+        """
+        Put every card back on the draw pile as if freshly created.
         
-        # === WHEAT/FOOD PRODUCTION CARDS (2 cards) ===
-        Card("add_wheat", cost=2, multiplier=41),  # +1 food production
-        Card("add_wheat", cost=3, painting=8),  # +1 food production
+        Restores the printed costs (the display overwrites Card.cost with
+        the slot cost) and clears any workers left on the cards. Nothing is
+        allocated; the draw order is whatever it was.
+        """
+        for card, cost in zip(self.cards, self.costs.tolist()):
+            card.cost = cost
+            card.clear()
+        self._head = 0
+
+
+class BuildingStacks:
+    """
+    The building tile stacks, one per board building slot.
+    
+    Each stack keeps its buildings in draw order; drawing advances that
+    stack's head index instead of popping from the front of a list.
+    
+    Attributes:
+        stacks (List[List[Building]]): All buildings of each stack, in draw order.
+        _heads (np.ndarray): (S,) index of the next building per stack.
+        _sizes (np.ndarray): (S,) number of buildings per stack.
+    """
+
+    __slots__ = ("stacks", "_heads", "_sizes")
+
+    def __init__(self, stacks: List[List]) -> None:
+        """
+        Args:
+            stacks (List[List[Building]]): Buildings per slot, in draw order.
+        """
+        self.stacks = stacks
+        self._heads = np.zeros(len(stacks), dtype=np.int64)
+        self._sizes = np.array([len(stack) for stack in stacks], dtype=np.int64)
+
+    def __len__(self) -> int:
+        """Number of stacks."""
+        return len(self.stacks)
+
+    def draw(self, slot: int):
+        """
+        Take the next building off a slot's stack.
         
-        # === DRAW CARD (1 card) ===
-        Card("draw_card", cost=3, painting=3),  # draw extra card
+        Args:
+            slot (int): Building slot (0-3).
         
-        # === ONE-USE TOOL CARDS (3 cards) ===
-        Card("one_use_tool", cost=1, data={"tool_value": 4}, multiplier=11),  # 4 tools
-        Card("one_use_tool", cost=2, data={"tool_value": 3}, multiplier=11),  # 3 tools  
-        Card("one_use_tool", cost=3, data={"tool_value": 2}, multiplier=12),  # 2 tools
+        Returns:
+            Building: The drawn building, or None if that stack is empty.
+        """
+        head = int(self._heads[slot])
+        stack = self.stacks[slot]
+        if head >= len(stack):
+            return None
+        self._heads[slot] = head + 1
+        return stack[head]
+
+    def remaining_counts(self) -> np.ndarray:
+        """
+        Number of buildings left per stack, all at once.
         
-        # === ANY 2 RESOURCES (1 card) ===
-        Card("any_2_resources", cost=2, painting=4),  # 2 resources of choice
-    ]
+        Returns:
+            np.ndarray: (S,) int64 remaining count per stack.
+        """
+        return self._sizes - self._heads
+
+    def all_buildings(self) -> list:
+        """Every building of every stack, drawn or not."""
+        return [building for stack in self.stacks for building in stack]
+
+
+# Civilization cards, one row per card:
+# (type_num, cost, data0, data1, multiplier, painting), 0 meaning "none"
+_CARD_SPEC: tuple[tuple[int, int, int, int, int, int], ...] = (
+    # === DICE ROLL CARDS (10 cards) ===
+    # Each player picks a die: 1=wood, 2=brick/clay, 3=stone, 4=gold, 5=tool, 6=wheat
+    (CardType.dice_roll, 0, 0, 0, 32, 0),   # pottery
+    (CardType.dice_roll, 0, 0, 0, 21, 0),   # 1 hut builder  
+    (CardType.dice_roll, 0, 0, 0, 22, 0),   # 2 hut builders
+    (CardType.dice_roll, 0, 0, 0, 41, 0),   # writing
+    (CardType.dice_roll, 0, 0, 0, 42, 0),   # 2 tool makers
+    (CardType.dice_roll, 0, 0, 0, 0, 1),   # 1 farmer
+    (CardType.dice_roll, 0, 0, 0, 0, 8),   # 2 farmers
+    (CardType.dice_roll, 0, 0, 0, 0, 2),   # time
+    (CardType.dice_roll, 0, 0, 0, 0, 3),   # transport
+    #(CardType.dice_roll, 0, 0, 0, 0, 2),   # medicine
+
+    # === FOOD CARDS (7 cards) ===
+    (CardType.add_resource, 1, 2, 7, 0, 2),   # 7 food
+    (CardType.add_resource, 1, 2, 2, 22, 0),   # 2 food
+    (CardType.add_resource, 2, 2, 4, 21, 0),   # 4 food
+    (CardType.add_resource, 2, 2, 5, 0, 4),   # 5 food
+    (CardType.add_resource, 3, 2, 3, 0, 5),   # 3 food
+    (CardType.add_resource, 3, 2, 1, 0, 5),   # 1 food
+    (CardType.add_resource, 4, 2, 3, 42, 0),   # 3 food
+
+    # === RESOURCE CARDS (5 cards) ===
+    (CardType.add_resource, 1, 4, 1, 41, 0),   # 1 stone
+    (CardType.add_resource, 2, 4, 2, 0, 1),   # 2 stones
+    (CardType.add_resource, 2, 4, 1, 31, 0),   # 1 stone
+    (CardType.add_resource, 3, 6, 1, 31, 0),   # 1 gold
+    (CardType.add_resource, 3, 5, 1, 32, 0),   # 1 brick
+
+    # === RESOURCES WITH DICE (3 cards) ===
+    (CardType.resources_with_dice, 2, 6, 0, 0, 6),     # gold
+    (CardType.resources_with_dice, 3, 3, 0, 32, 0),     # wood
+    (CardType.resources_with_dice, 3, 4, 0, 31, 0),     # stone
+
+    # === VICTORY POINTS (3 cards) ===
+    (CardType.add_vp, 2, 3, 0, 23, 0),   # 3 VP
+    (CardType.add_vp, 3, 3, 0, 0, 7),   # 3 VP
+    (CardType.add_vp, 4, 3, 0, 0, 7),   # 3 VP
+
+    # === TOOL CARD (1 card) ===
+    (CardType.add_tool, 2, 0, 0, 0, 6),   # +1 tool
+
+    # === WHEAT/FOOD PRODUCTION CARDS (2 cards) ===
+    (CardType.add_wheat, 2, 0, 0, 41, 0),  # +1 food production
+    (CardType.add_wheat, 3, 0, 0, 0, 8),  # +1 food production
+
+    # === DRAW CARD (1 card) ===
+    (CardType.draw_card, 3, 0, 0, 0, 3),  # draw extra card
+
+    # === ONE-USE TOOL CARDS (3 cards) ===
+    (CardType.one_use_tool, 1, 4, 0, 11, 0),  # 4 tools
+    (CardType.one_use_tool, 2, 3, 0, 11, 0),  # 3 tools  
+    (CardType.one_use_tool, 3, 2, 0, 12, 0),  # 2 tools
+
+    # === ANY 2 RESOURCES (1 card) ===
+    (CardType.any_2_resources, 2, 0, 0, 0, 4),  # 2 resources of choice
+)
+
+
+
+def create_card_deck(shuffle: bool = True, reuse: Optional[CardDeck] = None) -> CardDeck:
+    """
+    Create the official Stone Age 36 civilization card deck.
     
+    Card costs are 1-4 based on position (rightmost=1, leftmost=4).
+    
+    Args:
+        shuffle: Whether to shuffle the deck (default True)
+        reuse: A finished game's deck to reset and hand back instead of
+               building a new one (default None)
+    
+            1: 0,      # VP per tool value
+            2: 0,  # VP per building owned
+            3: 0,    # VP per worker
+            4: 0,      # VP per wheat
+    Returns:
+        CardDeck of the 36 cards
+    """
+    if reuse is not None:
+        deck = reuse
+        deck.reset()
+    else:
+        deck = CardDeck.from_spec(_CARD_SPEC)
     if shuffle:
-        random.shuffle(cards)
+        deck.shuffle(_rng)
     
-    return cards
+    return deck
 
 
-def create_building_decks() -> dict[int, list]:
+def create_building_decks() -> BuildingStacks:
     """
     Create the official Stone Age 28 building tile decks.
     
@@ -115,10 +279,10 @@ def create_building_decks() -> dict[int, list]:
     Resources: 3=wood, 4=stone, 5=clay/brick, 6=gold
     
     Returns:
-        Dict mapping stack index (0-3) to list of Building objects
+        BuildingStacks with one stack per building slot (0-3)
     """
-    return {
-        0: [
+    return BuildingStacks([
+        [
             # 2 same + 1 different type buildings
             CertainBuilding(resources=[3, 3, 5]),      # 2 wood + 1 brick = 10 pts
             CertainBuilding(resources=[3, 3, 4]),      # 2 wood + 1 stone = 11 pts
@@ -129,7 +293,7 @@ def create_building_decks() -> dict[int, list]:
             # Flex buildings - 4 resources  # 4 resources, 1 kind
             FlexBuilding(resources_require_count=4, variety=2),  # 4 resources, 2 kinds
         ],
-        1: [
+        [
             CertainBuilding(resources=[3, 3, 6]),      # 2 wood + 1 gold = 12 pts
             CertainBuilding(resources=[3, 4, 4]),      # 1 wood + 2 stone = 13 pts
             CertainBuilding(resources=[5, 5, 4]),      # 2 brick + 1 stone = 13 pts
@@ -140,7 +304,7 @@ def create_building_decks() -> dict[int, list]:
             FlexBuilding(resources_require_count=4, variety=3),  # 4 resources, 3 kinds
             FlexBuilding(resources_require_count=4, variety=4),  # 4 resources, 4 kinds
         ],
-        2: [
+        [
             CertainBuilding(resources=[5, 5, 6]),      # 2 brick + 1 gold = 14 pts
             CertainBuilding(resources=[5, 4, 4]),      # 1 brick + 2 stone = 14 pts
             CertainBuilding(resources=[4, 4, 6]),      # 2 stone + 1 gold = 16 pts
@@ -149,7 +313,7 @@ def create_building_decks() -> dict[int, list]:
             FlexBuilding(resources_require_count=5, variety=2),  # 5 resources, 2 kinds  # 5 resources, 3 kinds
             FlexBuilding(resources_require_count=5, variety=4),  # 5 resources, 4 kinds
         ],
-        3: [
+        [
             # 1-7 resources any kind (3 cards in official game)
             FlexBuilding(resources_require_count=5, variety=3),  # 1-7 resources
             FlexBuilding(resources_require_count=7, variety=None),  # 1-7 resources
@@ -159,7 +323,7 @@ def create_building_decks() -> dict[int, list]:
             CertainBuilding(resources=[4, 5, 6]),      # stone + clay + gold
             CertainBuilding(resources=[3, 4, 6]),      # wood + stone + gold      # wood + clay + gold
         ],
-    }
+    ])
 
 
 def create_starting_cards() -> list[Card]:
@@ -170,10 +334,10 @@ def create_starting_cards() -> list[Card]:
         List of 4 Card objects for initial board setup
     """
     return [
-        Card("add_resource", cost=1, data={"resources": 2, "amount": 5}, painting=1),
-        Card("add_resource", cost=2, data={"resources": 2, "amount": 4}, painting=1),
-        Card("dice_roll", cost=3, painting=1),
-        Card("add_tool", cost=4, painting=2),
+        Card(CardType.add_resource, cost=1, resource_type=2, amount=5, painting=1),
+        Card(CardType.add_resource, cost=2, resource_type=2, amount=4, painting=1),
+        Card(CardType.dice_roll, cost=3, painting=1),
+        Card(CardType.add_tool, cost=4, painting=2),
     ]
 
 
@@ -11,25 +11,102 @@ testing game logic or training a reinforcement learning agent.
 Classes:
     Game: Main game controller managing all game state and mechanics.
 """
-from itertools import combinations_with_replacement
 from typing import List, Dict, Optional, Any, Union
 import random
 import numpy as np
-from action_system import ActionSystem, MaskGenerator
+from action_system import ActionSystem, MaskGenerator, TOOL_CHOICES
+from jit import njit
 
 
 from itertools import product
 
-from area import Gathering, Area
+from area import (Gathering, Area, BoardState, NullLocation, NULL_LOCATION, KIND_CARD,
+                  KIND_CERTAIN_BUILDING, KIND_FARM, KIND_GATHERING, KIND_HOUSE,
+                  KIND_TOOLSHOP)
 from player import Player
 from building import CertainBuilding, FlexBuilding, Building
 from card import Card
+from card_types import CardType
 from utility import Utility
-from decks import create_card_deck
+from decks import BuildingStacks, CardDeck, create_card_deck
 from decks import create_building_decks
 
 
-Location = Union[Utility, Gathering, Card, FlexBuilding, CertainBuilding, None]
+# Players per game (Game.players is a fixed tuple of this many)
+NUM_PLAYERS = 4
+
+# Dice pre-rolled per refill of the dice buffer (see Game.roll_dice_sum)
+DICE_BUFFER = 256
+
+# Debug trace of buy/skip decisions. Off for self-play: printing on every
+# step dominates the run time.
+_LOG = False
+
+Location = Union[Utility, Gathering, Card, FlexBuilding, CertainBuilding, NullLocation]
+
+# Layout of the get_state() vector
+MAX_ONE_USE_TOOLS = 3
+MAX_DECK_CARDS = 8            # Per card collection (2 collections)
+_OFF_RESOURCES = 5            # After round, wheat, workers, available, VP
+_OFF_MULTIPLIERS = _OFF_RESOURCES + 5
+_OFF_TOOLS = _OFF_MULTIPLIERS + 4
+_OFF_ONE_USE = _OFF_TOOLS + 8
+_OFF_DRAWINGS = _OFF_ONE_USE + MAX_ONE_USE_TOOLS
+_OFF_BOARD = _OFF_DRAWINGS + 2 * MAX_DECK_CARDS
+_OFF_DECK_SIZES = _OFF_BOARD + 16 * 4
+_OFF_BUILDINGS = _OFF_DECK_SIZES + 4
+_OFF_CARDS = _OFF_BUILDINGS + 4 * 3
+_OFF_ACTION = _OFF_CARDS + 1 + 4 * 5
+STATE_SIZE = _OFF_ACTION + 5
+
+# State features of an empty card / building slot (see Card._state_tuple
+# and Building._state_tuple)
+_ZERO_CARD = np.zeros(5, dtype=np.float32)
+_ZERO_BUILDING = np.zeros(3, dtype=np.float32)
+
+
+@njit(cache=True)
+def _enumerate_spends(wood, stone, clay, gold, cost, variety):
+    """
+    Every [wood, stone, clay, gold] payment of exactly cost resources.
+    
+    Counts are bounded by the holdings passed in, most wood first, then
+    stone, then clay (the order combinations_with_replacement gave).
+    
+    Args:
+        wood, stone, clay, gold (int): Resources held.
+        cost (int): Number of resources to pay.
+        variety (int): Exact number of types to use, -1 for any.
+    
+    Returns:
+        np.ndarray: (N, 4) int64, one row per valid payment.
+    """
+    # At most every way to split cost over 4 types: C(cost + 3, 3)
+    n_max = max(cost + 1, 0) * (cost + 2) * (cost + 3) // 6
+    out = np.empty((n_max, 4), dtype=np.int64)
+    k = 0
+    for w in range(min(cost, wood), -1, -1):
+        rest_w = cost - w
+        for st in range(min(rest_w, stone), -1, -1):
+            rest_st = rest_w - st
+            # Gold takes whatever clay leaves, so clay can't go below that
+            for c in range(min(rest_st, clay), max(rest_st - gold, 0) - 1, -1):
+                g = rest_st - c
+                if variety >= 0 and int(w > 0) + int(st > 0) + int(c > 0) + int(g > 0) != variety:
+                    continue
+                out[k, 0] = w
+                out[k, 1] = st
+                out[k, 2] = c
+                out[k, 3] = g
+                k += 1
+    return out[:k]
+
+
+def _write_padded(buf: np.ndarray, off: int, size: int, values: List[int]) -> None:
+    """Write up to size values at buf[off:], zero-filling the rest."""
+    n = min(len(values), size)
+    buf[off:off + n] = values[:n]
+    buf[off + n:off + size] = 0
 
 
 class Game:
@@ -53,11 +130,17 @@ class Game:
         cards (List[Card]): Cards available for purchase on the board.
         buildings (List[Building]): Buildings available for purchase.
         locations (List): All board locations (utilities, gatherings, cards, buildings).
-        cards_in_deck (List[Card]): Remaining cards in deck to draw from.
-        buildings_in_deck (Dict[int, List[Building]]): Remaining buildings per location.
+        cards_in_deck (CardDeck): Remaining cards in deck to draw from.
+        buildings_in_deck (BuildingStacks): Remaining buildings per building slot.
+        board (BoardState): Occupancy of every area in this game as arrays.
+        _loc_rows (np.ndarray): BoardState row of each location slot.
         first_player (int): Index of the starting player this round.
         current_type_of_action (list): Encoded action state for neural network.
     """
+
+    # Every (resource, resource) pick of the any_2_resources card; the same
+    # in every state
+    _CHOOSE_2_RESOURCE_ACTIONS = tuple(product(range(2, 7), repeat=2))
     
     def __init__(self) -> None:
         """
@@ -93,7 +176,11 @@ class Game:
         Args:
             seed (int, optional): Random seed for reproducible games.
         """
-        self.players: List[Player] = (Player(), Player(), Player(), Player())
+        self.players: List[Player] = tuple(Player() for _ in range(NUM_PLAYERS))
+        # Player.available_workers of every player, mirrored by place_worker
+        # and refresh_humans so the placement phase check is one reduction
+        self._available_workers = np.array([p.available_workers for p in self.players],
+                                           dtype=np.int8)
         
         # Game state tracking
         self.round = 0
@@ -101,10 +188,10 @@ class Game:
         
         # Cards available on board (up to 4)
         self.cards: List[Card] = [
-            Card("add_resource", cost=1, data={"resources": 2, "amount": 8}),
-            Card("add_resource", cost=2, data={"resources": 2, "amount": 8}),
-            Card("add_resource", cost=3, data={"resources": 2, "amount": 8}),
-            Card(card_type="add_resource", cost=4, data={"resources": 2, "amount": 8}),
+            Card(CardType.add_resource, cost=1, resource_type=2, amount=8),
+            Card(CardType.add_resource, cost=2, resource_type=2, amount=8),
+            Card(CardType.add_resource, cost=3, resource_type=2, amount=8),
+            Card(card_type=CardType.add_resource, cost=4, resource_type=2, amount=8),
         ]
         
         # Buildings available on board (up to 4)
@@ -137,10 +224,29 @@ class Game:
         self.locations.extend(self.buildings)
         
         # Deck of cards to draw from when cards are purchased
-        self.cards_in_deck: List[Card] = create_card_deck()
+        # A reset game keeps its own deck and puts every card back in it
+        self.cards_in_deck: CardDeck = create_card_deck(
+            reuse=getattr(self, "cards_in_deck", None))
         
         # Deck of buildings by location index
-        self.buildings_in_deck: Dict[int, List[Building]] = create_building_decks()
+        self.buildings_in_deck: BuildingStacks = create_building_decks()
+
+        # Every area this game can show, as one occupancy table; the areas'
+        # occupants become views into it. _loc_rows maps slots to rows.
+        self.board = BoardState(self.locations + list(self.cards_in_deck)
+                                + self.buildings_in_deck.all_buildings())
+        self._loc_rows = np.array([self.board.row_of(location) for location in self.locations],
+                                  dtype=np.intp)
+        
+        # Reused output buffer of get_state()
+        self._state_buf = np.zeros(STATE_SIZE, dtype=np.float32)
+        
+        # Dice RNG (PCG64); seeded games roll the same dice
+        self._rng = np.random.default_rng(seed)
+        # Pre-rolled dice, consumed from _dice_head (starts exhausted, so
+        # the first roll fills it from _rng)
+        self._dice_buf = np.empty(DICE_BUFFER, dtype=np.int8)
+        self._dice_head = DICE_BUFFER
         
         # Game flow tracking
         self.first_player = random.randint(0,3)
@@ -150,6 +256,13 @@ class Game:
         self.current_type_of_action = 1
         self.current_action_data = [0,0,0,0]
         self.game_end = False
+        # Empty card + building slots on the board, kept by buy_*/replace_*
+        self._empty_slots = 0
+        # Bumped by play_step and the board helpers below; MaskGenerator
+        # reuses its mask while it is unchanged. Code that edits the game
+        # directly must bump it too. Never reset, so a new game never
+        # matches a version cached for the previous one.
+        self.state_version = getattr(self, "state_version", -1) + 1
 
         self.action_system = ActionSystem(self.locations)
         self.mask_generator = MaskGenerator(self.action_system)
@@ -158,104 +271,154 @@ class Game:
     def game_ended(self) -> bool:
         if self.round >= 50:
             return True
+        # Both end conditions need an empty board slot
+        if self._empty_slots == 0:
+            return False
         # End if card deck AND all board card slots are empty
         if len(self.cards_in_deck) == 0 and any(c is None for c in self.cards):
             return True
         # End if any building stack is fully depleted
-        for i, deck in self.buildings_in_deck.items():
-            if len(deck) == 0 and self.buildings[i] is None:
+        for i, left in enumerate(self.buildings_in_deck.remaining_counts().tolist()):
+            if left == 0 and self.buildings[i] is None:
                 return True
         return False
                 
     def get_valid_actions_for_choose_2_resources(self):
-        all_actions = []
-        for combo in product(range(2,7), repeat=2):
-            all_actions.append(combo)
-        return all_actions
+        return self._CHOOSE_2_RESOURCE_ACTIONS
             
     
-    def get_valid_actions_for_placement(self):
-        locations_space = []
-        for index, location in enumerate(self.locations):
-            # Check if location has space and can accept placements
-            if location is not None and location.can_place():
-                locations_space.append([
-                    index,
-                    min(location.available_space(), self.current_player.available_workers),
-                ])
+    def placement_limits(self) -> np.ndarray:
+        """
+        Most workers the current player can place on each location.
+        
+        Free slots of every location in one sweep, capped by the player's
+        available workers (empty slots have no free space).
+        
+        Returns:
+            np.ndarray: (16,) int, 0 where nothing can be placed.
+        """
+        spaces = self.board.available_space(self._loc_rows)
+        return np.minimum(spaces, self.current_player.available_workers)
 
+    def get_valid_actions_for_placement(self):
+        limits = self.placement_limits()
         all_actions = []
-
-        # Is equivalent to:
-        for loc_index, avaliable_space in locations_space:
-            for i in range(1, avaliable_space+1):
-                all_actions.append([loc_index,i])
+        # Only locations with free space
+        for loc_index in np.flatnonzero(limits > 0).tolist():
+            for i in range(1, int(limits[loc_index]) + 1):
+                all_actions.append([loc_index, i])
 
         return all_actions
     
     def get_valid_actions_for_tools_choose(self):
-        avaliable_tools = []
-        all_actions = []
-        for index, tool in enumerate(self.current_player.tools):
+        """
+        List every valid tool choice of the current player.
+        
+        Looked up in the precomputed TOOL_CHOICES table by the packed set
+        of usable tools (see get_available_tools_key).
+        
+        Returns:
+            tuple: 7-flag tuples [t0, t1, t2, t3, o0, o1, o2], shared
+                   between calls, so don't modify them.
+        """
+        return TOOL_CHOICES[self.get_available_tools_key()]
+
+    def get_available_tools_key(self) -> int:
+        """
+        Pack which tools the current player can use into a 7-bit int.
+        
+        Same bit layout as ActionSystem tool actions: tool slots 0-3 then
+        one-use tools 0-2, with tool slot 0 as the highest bit.
+        
+        Returns:
+            int: Key in [0, 127]; every valid tool action is a subset of it.
+        """
+        player = self.current_player
+        key = 0
+        for index, tool in enumerate(player.tools):
             if tool[1] == True and tool[0] > 0:
-                avaliable_tools.append(index)
-        for i in range(len(self.current_player.one_use_tools)):
-            avaliable_tools.append(i+4)
-        for combo in product([0, 1], repeat=len(avaliable_tools)):
-            lst = [0] * 7
-            for i, pos in enumerate(avaliable_tools):
-                lst[pos] = combo[i]
-            all_actions.append(lst)
-        return all_actions
+                key |= 1 << (6 - index)
+        for i in range(len(player.one_use_tools)):
+            key |= 1 << (2 - i)
+        return key
 
-    def get_valid_actions_for_spending_resources(self) -> list[list[int]]:
+    def get_valid_actions_for_spending_resources(self) -> np.ndarray:
+        """
+        Return every valid way to pay for the current card/flex building.
+        
+        Returns:
+            np.ndarray: (N, 4) int array, one [wood, stone, clay, gold] row
+                        per valid payment.
+        """
         data = self.locations[self.current_action_data[0]]
 
-        if not isinstance(data, (Building, Card)):
+        if data.kind_code < KIND_CARD:
             raise Exception("Current action data isn't a flex building or a card")
                 
-        valid_actions = []
-
-        if isinstance(data, Card):
-            return self.get_variants_to_spend_resources(data.cost)
-        
-        
-        if data.resources_require_count == 7:
-            available = self.current_player.resources  # {3: 2, 4: 1, 5: 3, 6: 0}
-    
-            max_spend = min(7, sum(available.values()))
-    
-            for n in range(1, max_spend + 1):
-                valid_actions.extend(self.get_variants_to_spend_resources(n))
+        # [0, 0, food, wood, stone, clay, gold], read once for the kernel
+        available = self.current_player.resources
+        _, _, _, wood, stone, clay, gold = available
+
+        if data.kind_code == KIND_CARD:
+            valid_actions = _enumerate_spends(wood, stone, clay, gold, data.cost, -1)
+        elif data.resources_require_count == 7:
+            max_spend = min(7, sum(available))
+            valid_actions = np.concatenate(
+                [_enumerate_spends(wood, stone, clay, gold, n, -1)
+                 for n in range(1, max_spend + 1)] or [np.empty((0, 4), dtype=np.int64)])
         else:
-            return self.get_variants_to_spend_resources(data.resources_require_count, data.variety)
+            variety = -1 if data.variety is None else data.variety
+            valid_actions = _enumerate_spends(wood, stone, clay, gold,
+                                              data.resources_require_count, variety)
     
-        return valid_actions
+        return valid_actions.astype(np.intp, copy=False)
     
+    def get_spending_constraints(self) -> tuple[int, int, int]:
+        """
+        Describe what counts as a valid payment for the current card/flex building.
+        
+        Matches get_valid_actions_for_spending_resources: a card costs exactly
+        its cost, the "1-7 resources" building takes any 1-7 resources, and
+        other flex buildings take an exact count from exactly `variety` types.
+        
+        Returns:
+            tuple[int, int, int]: (min_cost, max_cost, variety), variety is -1
+                                  when any number of resource types may be used.
+        """
+        data = self.locations[self.current_action_data[0]]
+
+        if data.kind_code < KIND_CARD:
+            raise Exception("Current action data isn't a flex building or a card")
+
+        if data.kind_code == KIND_CARD:
+            return data.cost, data.cost, -1
+        if data.resources_require_count == 7:
+            return 1, 7, -1
+        variety = data.variety if data.variety is not None else -1
+        return data.resources_require_count, data.resources_require_count, variety
+
     def get_variants_to_spend_resources(self, cost: int, fixed_variety: Optional[int] = None):
-        available = self.current_player.resources  # {3: 2, 4: 1, 5: 3, 6: 0}
-        resource_types = [3,4,5,6]
-        
-        valid_actions = []
-        for combo in combinations_with_replacement(resource_types, cost):
-            # Count each resource type in this combo
-            counts = {r: combo.count(r) for r in resource_types}
-            # Check if player can afford
-            
-            if fixed_variety is not None:
-                # Count how many different types are used
-                types_used = (fixed_variety == sum(1 for r in resource_types if counts[r] > 0))
-            else:
-                types_used = True
-            
-            if types_used and all(counts[r] <= available[r] for r in resource_types):
-                # Convert to list format: [wood_count, clay_count, stone_count, gold_count]
-                valid_actions.append([counts[r] for r in resource_types])
-        return valid_actions
+        """
+        List every affordable way to pay exactly cost resources.
+        
+        The player's counts are read once into scalars and passed to the
+        _enumerate_spends kernel, which enumerates the payments directly.
+        
+        Args:
+            cost (int): Number of resources to pay.
+            fixed_variety (int, optional): Exact number of resource types
+                                           the payment must use.
+        
+        Returns:
+            list: [wood, stone, clay, gold] count lists.
+        """
+        _, _, _, wood, stone, clay, gold = self.current_player.resources
+        variety = -1 if fixed_variety is None else fixed_variety
+        return _enumerate_spends(wood, stone, clay, gold, cost, variety).tolist()
 
-    def get_mask(self):
-        """Generate binary mask for currently valid actions."""
-        return self.mask_generator.get_mask(self)
+    def get_mask(self, copy: bool = False):
+        """Generate binary mask for currently valid actions (read-only unless copy=True)."""
+        return self.mask_generator.get_mask(self, copy)
 
     def executing_placing_workers(self, action: Any) -> bool:
         """
@@ -286,12 +449,12 @@ class Game:
         Check if the placement phase is still ongoing.
         
         The placement phase continues as long as any player has available
-        workers to place.
+        workers to place (read from the _available_workers mirror).
         
         Returns:
             bool: True if any player has workers to place, False if all done.
         """
-        return any(p.available_workers > 0 for p in self.players)
+        return bool(self._available_workers.any())
 
     def place_worker(self, location_id: int, count: int = 1) -> None:
         """
@@ -304,11 +467,14 @@ class Game:
             count (int): Number of workers to place (default: 1).
         """
         
-        # Update location occupancy
-        self.locations[location_id].place(self.current_player_idx, count)
+        # Update location occupancy (place() refuses to exceed capacity)
+        if not self.locations[location_id].place(self.current_player_idx, count):
+            raise Exception("Cant place there!!")
         
         # Update player's available workers
         self.current_player.available_workers -= count
+        self._available_workers[self.current_player_idx] -= count
+        self.state_version += 1
 
     def next_player(self) -> Player:
         """
@@ -317,13 +483,23 @@ class Game:
         Returns:
             Player: The next player whose turn it is.
         """
-        self.current_player_idx = (self.current_player_idx + 1) % len(self.players)
+        self.current_player_idx = (self.current_player_idx + 1) % NUM_PLAYERS
         return self.current_player
     
     def next_player_to_gather(self):
-        self.current_player_idx = (self.current_player_idx + 1) % len(self.players)
-        if self.current_player.available_workers == 0:
-            self.next_player_to_gather()
+        """
+        Pass the turn to the next player who still has workers to place.
+        
+        Checks at most NUM_PLAYERS players; callers only get here while
+        round_not_over(), so one of them has workers.
+        """
+        available = self._available_workers
+        idx = self.current_player_idx
+        for _ in range(NUM_PLAYERS):
+            idx = (idx + 1) % NUM_PLAYERS
+            if available[idx] > 0:
+                break
+        self.current_player_idx = idx
 
     def resolve_locations(self) -> None:
         """
@@ -339,59 +515,56 @@ class Game:
         - Card: Player chooses whether to purchase
         """
         
-        for index, location in enumerate(self.locations):
-            if location is None or not location.is_occupied(self.current_player_idx):
-                continue
-
-            # ===== UTILITY RESOLUTION =====
-            if isinstance(location, Utility):
-                if location.name() == "Farm":
-                    self.current_player.get_wheat(1)
-                elif location.name() == "House":
-                    self.current_player.get_worker(1)
-                elif location.name() == "ToolShop":  # Note: original had "Tools"
-                    self.current_player.get_tool()
-                location.occupants[self.current_player_idx] = 0
-
-            # ===== GATHERINH RESOLUTION =====
-            elif isinstance(location, Gathering):
-                self.current_type_of_action = 2
-                worker_count = location.occupants[self.current_player_idx]
-                self.current_action_data = [location.resource_type, sum(random.randint(1, 6) for _ in range(worker_count)),0,0]
-                ##self.resolve_gathering()
-                return
-
-            # ===== CARD RESOLUTION =====
-            elif isinstance(location, Card):
-                self.current_type_of_action = 3
-                self.current_action_data = [index,0,0,0]
-                return
-            
-            # ===== FLEX BUILDING RESOLUTION =====
-            elif isinstance(location, FlexBuilding):
-                self.current_type_of_action = 3
-                self.current_action_data = [index,0,0,0]
-                return
-                
-            
-            # ===== CERTAIN BUILDING RESOLUTION =====
-            elif isinstance(location, CertainBuilding):
-                self.current_type_of_action = 3
-                self.current_action_data = [index,0,0,0]
-                return
-            
-        if self.check_if_any_uncollectedhumans_left():
+        locations = self.locations
+        # One pass per player, moving on until a choice is pending or no
+        # workers are left on the board
+        while True:
+            # The player doesn't change inside a pass, so look it up once
+            player = self.current_player
+            player_idx = self.current_player_idx
+
+            occupied = self.board.occupied_by(self._loc_rows, player_idx)
+            for index in np.flatnonzero(occupied).tolist():
+                location = locations[index]
+                kind = location.kind_code
+
+                # ===== CARD / BUILDING RESOLUTION =====
+                # Player chooses whether to buy (kinds KIND_CARD and up)
+                if kind >= KIND_CARD:
+                    self.current_type_of_action = 3
+                    self.current_action_data = [index,0,0,0]
+                    return
+
+                # ===== GATHERINH RESOLUTION =====
+                if kind == KIND_GATHERING:
+                    self.current_type_of_action = 2
+                    # As a Python int: a numpy int16 would leak into the dice head
+                    worker_count = int(location.occupants[player_idx])
+                    self.current_action_data = [location.resource_type, self.roll_dice_sum(worker_count),0,0]
+                    ##self.resolve_gathering()
+                    return
+
+                # ===== UTILITY RESOLUTION =====
+                if kind == KIND_FARM:
+                    player.get_wheat(1)
+                elif kind == KIND_HOUSE:
+                    player.get_worker(1)
+                elif kind == KIND_TOOLSHOP:
+                    player.get_tool()
+                location.remove(player_idx)
+
+            if not self.check_if_any_uncollectedhumans_left():
+                break
             self.next_player()
-            self.resolve_locations()
-        else:
-            self.finish_round()
+
+        self.finish_round()
     
     def finish_round(self):
         self.feed_players()
 
         self.round += 1
 
-        self.first_player = (self.first_player + 1) % len(self.players)
+        self.first_player = (self.first_player + 1) % NUM_PLAYERS
         # ===== REPLENISHMENT PHASE =====
         # Reset workers and restock board
         self.refresh_humans()
@@ -420,7 +593,7 @@ class Game:
         self.current_player.get_resource_with_die(self.current_action_data[0], self.current_action_data[1], tools)
 
         if self.current_type_of_action == 2:
-            self.locations[self.current_action_data[0]+1].occupants[self.current_player_idx] = 0
+            self.locations[self.current_action_data[0]+1].remove(self.current_player_idx)
 
 
     def apply_card_effect(self, card: Card) -> None: #TODO implement AI logic
@@ -441,59 +614,63 @@ class Game:
         Args:
             card (Card): The card whose effect is being applied.
         """
-        effect_type = card.card_type
+        # Integer compares on the card's numeric type ID
+        effect_type = card.card_id
         effect = card.immediate_effect()
-        
-        if effect_type == "add_resource":
-            # Grant specified resources
-            resource_type = effect[0]
-            resource_amount = effect[1]
-            self.current_player.get_resources(resource_type, resource_amount)
+        player = self.current_player
+        
+        # Branches are ordered by how often each type is bought in self-play
+        # (add_resource far ahead, then dice_roll), so the usual card exits
+        # after one or two compares. Keep this order when adding types.
+        if effect_type == CardType.add_resource:
+            # Grant specified resources (effect is (resource_type, amount));
+            # get_resources also keeps non_food_total in step
+            player.get_resources(*effect)
             self.resolve_locations()
         
-        elif effect_type == "dice_roll":
+        elif effect_type == CardType.dice_roll:
             # Roll dice for each player and offer choices
-            dices = self.roll_dice_separate(len(self.players))
+            dices = self.roll_dice_separate(NUM_PLAYERS)
             self.current_action_data = dices
             self.current_type_of_action = 5
         
-        elif effect_type == "resources_with_dice":
+        elif effect_type == CardType.add_vp:
+            # Award victory points
+            player.vp += effect[0]
+            self.resolve_locations()
+        
+        elif effect_type == CardType.resources_with_dice:
             # Roll dice and gather specific resource
-            dice_sum = sum(random.randint(1, 6) for _ in range(2))
+            dice_sum = self.roll_dice_sum(2)
             resource_type = effect[0]
             self.current_type_of_action = 2
             self.current_action_data = [resource_type, dice_sum, 0, 0]
         
-        elif effect_type == "add_vp":
-            # Award victory points
-            self.current_player.vp += effect[0]
-            self.resolve_locations()
-        
-        elif effect_type == "add_tool":
-            # Grant tool
-            self.current_player.get_tool()
+        elif effect_type == CardType.one_use_tool:
+            # Grant single-use tool
+            player.get_one_use_tool(effect[0])
             self.resolve_locations()
         
-        elif effect_type == "add_wheat":
+        elif effect_type == CardType.add_wheat:
             # Grant wheat
-            self.current_player.get_wheat(1)
+            player.get_wheat(1)
             self.resolve_locations()
         
-        elif effect_type == "draw_card":
+        elif effect_type == CardType.draw_card:
             # Draw and apply another card
             card = self.draw_card()
             if card is not None:
-                self.current_player.get_card(card.end_game_effect())
-            self.resolve_locations()
-        
-        elif effect_type == "one_use_tool":
-            # Grant single-use tool
-            self.current_player.get_one_use_tool(effect[0])
+                player.get_card(card.end_game_effect())
             self.resolve_locations()
         
-        elif effect_type == "any_2_resources":
+        elif effect_type == CardType.any_2_resources:
             # Let player choose 2 resources to gain
             self.current_type_of_action = 6
+        
+        elif effect_type == CardType.add_tool:
+            # Grant tool
+            player.get_tool()
+            self.resolve_locations()
 
     def feed_players(self) -> None:
         """
@@ -531,19 +708,21 @@ class Game:
         
         Shifts remaining cards to fill gaps and draws new cards to
         maintain the card display.
+        
+        One compaction pass: the remaining cards move left in order, new
+        cards fill the slots after them, and every slot is rewritten once.
+        A shifted card leaves its old slot (it is never shown twice).
         """
-        # Find empty slots
-        empty_index = []
-        for index, card in enumerate(self.cards):
+        cards = self.cards
+        kept = [card for card in cards if card is not None]
+        while len(kept) < len(cards):
+            card = self.draw_card()
             if card is None:
-                empty_index.append(index)
-            # Shift remaining cards into empty slots
-            elif empty_index:
-                self.replace_card(empty_index.pop(0), card)
+                break
+            kept.append(card)
         
-        # Fill remaining empty slots with new cards from deck
-        for index in empty_index:
-            self.replace_card(index, self.draw_card())
+        for index in range(len(cards)):
+            self.replace_card(index, kept[index] if index < len(kept) else None)
 
     def replace_card(self, index: int, new_card: Optional[Card]) -> None:
         """
@@ -553,12 +732,17 @@ class Game:
         
         Args:
             index (int): Index in the cards list (0-3).
-            new_card (Card): The new card to place.
+            new_card (Card | None): The new card to place, or None to
+                                    empty the slot.
         """
+        self._empty_slots += (new_card is None) - (self.cards[index] is None)
         self.cards[index] = new_card
         # Card locations start at index 8 in locations list
-        self.locations[8 + index] = new_card
-        new_card.cost = index + 1
+        self.locations[8 + index] = NULL_LOCATION if new_card is None else new_card
+        self._loc_rows[8 + index] = self.board.row_of(new_card)
+        if new_card is not None:
+            new_card.cost = index + 1
+        self.state_version += 1
 
     def replace_building(self, index: int, new_building: Building) -> None:
         """
@@ -570,41 +754,47 @@ class Game:
             index (int): Index in the buildings list (0-3).
             new_building (Building): The new building to place.
         """
+        self._empty_slots -= self.buildings[index] is None
         self.buildings[index] = new_building
         # Building locations start at index 12 in locations list
         self.locations[12 + index] = new_building
+        self._loc_rows[12 + index] = self.board.row_of(new_building)
+        self.state_version += 1
 
-    def buy_building(self, building_index: Building, resources = None) -> None:
+    def buy_building(self, location_index: int, vp: int) -> None:
         """
         Mark a building as purchased (remove from board).
         
-        Sets the building to None, which will trigger replenishment.
-        Also increments the current player's building count.
+        Sets the building's slot to None, which will trigger replenishment.
+        Also credits the current player with the building's VP (the sum of
+        the resources paid).
         
         Args:
-            building (Building): The building being purchased.
+            location_index (int): Index of the building in locations (12-15).
+            vp (int): VP the building is worth.
         """
-        self.current_player.vp_buildings += sum(v for v in resources)
-        # Find and remove the building
-        self.buildings[building_index-12] = None
-        self.locations[building_index] = None
+        self.current_player.vp_buildings += vp
+        self.buildings[location_index - 12] = None
+        self._empty_slots += 1
+        self.locations[location_index] = NULL_LOCATION
+        self._loc_rows[location_index] = self.board.EMPTY_ROW
+        self.state_version += 1
 
 
-    def buy_card(self, card: Card) -> None:
+    def buy_card(self, location_index: int) -> None:
         """
         Mark a card as purchased (remove from board).
         
-        Sets the card to None, which will trigger replenishment.
+        Sets the card's slot to None, which will trigger replenishment.
         
         Args:
-            card (Card): The card being purchased.
+            location_index (int): Index of the card in locations (8-11).
         """
-        # Find and remove the card
-        for i, c in enumerate(self.cards):
-            if c is card:
-                self.cards[i] = None
-                self.locations[8 + i] = None
-                break
+        self.cards[location_index - 8] = None
+        self._empty_slots += 1
+        self.locations[location_index] = NULL_LOCATION
+        self._loc_rows[location_index] = self.board.EMPTY_ROW
+        self.state_version += 1
 
     def refresh_humans(self) -> None:
         """
@@ -612,12 +802,12 @@ class Game:
         
         Called after feeding phase to reset available workers for next round.
         """
-        for p in self.players:
-            p.available_workers = p.total_workers
+        for i, p in enumerate(self.players):
+            p.available_workers = self._available_workers[i] = p.total_workers
         
         for location in self.locations:
-            if location is not None:
-                location.clear()
+            location.clear()
+        self.state_version += 1
 
     def refresh_tools(self) -> None:
         for p in self.players:
@@ -631,10 +821,7 @@ class Game:
         Returns:
             Card: The drawn card, or None if deck is empty.
         """
-        if self.cards_in_deck:
-            card = self.cards_in_deck.pop(0)
-            return card
-        return None
+        return self.cards_in_deck.draw()
 
     def draw_building(self, location_id: int) -> Optional[Building]:
         """
@@ -646,11 +833,44 @@ class Game:
         Returns:
             Building: The drawn building, or None if deck is empty.
         """
-        if location_id in self.buildings_in_deck and self.buildings_in_deck[location_id]:
-            b = self.buildings_in_deck[location_id].pop(0)
+        if location_id >= len(self.buildings_in_deck):
+            return None
+        b = self.buildings_in_deck.draw(location_id)
+        if b is not None:
             self.replace_building(location_id, b)
-            return b
-        return None
+        return b
+
+    def _take_dice(self, count: int) -> np.ndarray:
+        """
+        Take the next count dice from the pre-rolled buffer.
+        
+        The buffer holds DICE_BUFFER dice and is refilled from _rng in one
+        call when it runs out.
+        
+        Args:
+            count (int): Number of dice (at most DICE_BUFFER).
+        
+        Returns:
+            np.ndarray: (count,) int8 view of the buffer.
+        """
+        head = self._dice_head
+        if head + count > DICE_BUFFER:
+            self._dice_buf = self._rng.integers(1, 7, size=DICE_BUFFER, dtype=np.int8)
+            head = 0
+        self._dice_head = head + count
+        return self._dice_buf[head:head + count]
+
+    def roll_dice_sum(self, count: int) -> int:
+        """
+        Roll count dice and return their sum.
+        
+        Args:
+            count (int): Number of dice to roll (at most DICE_BUFFER).
+        
+        Returns:
+            int: Sum of the rolled dice.
+        """
+        return int(self._take_dice(count).sum())
 
     def roll_dice_separate(self, count: int) -> list:
         """
@@ -660,7 +880,7 @@ class Game:
         Returns:
             list: List of dice rolls.
         """
-        return [random.randint(1, 6) for _ in range(count)]
+        return self._take_dice(count).tolist()
 
     def get_state(self) -> np.ndarray:
         """
@@ -677,123 +897,90 @@ class Game:
         - Available cards info
         - Action encoding
         
-        Total size: 148 elements (must match network input size)
+        Total size: STATE_SIZE elements (must match network input size).
+        The sections are written by offset into a buffer allocated once
+        per game, instead of growing a list and converting it.
         
         Returns:
             np.ndarray: 1D array of float32 values representing game state.
         """
-        # Extract current player state
-        resources = list(self.current_player.resources.values())
-        tools = self.current_player.tools
-        one_use_tools = self.current_player.one_use_tools
-        multipliers = list(self.current_player.multipliers.values())
-        wheat = self.current_player.wheat
-        drawings = self.current_player.card_effects
-        total_workers = self.current_player.total_workers
-        available_workers = self.current_player.available_workers
-
-        flat_state = []
+        player = self.current_player
+        tools = player.tools
+        drawings = player.card_effects
+        multipliers = player.multipliers
+        buf = self._state_buf
 
         # === Scalars (5) ===
-        flat_state.append(self.round)
-        flat_state.append(wheat)
-        flat_state.append(total_workers)
-        flat_state.append(available_workers)
-        flat_state.append(self.current_player.get_vp())
+        buf[0] = self.round
+        buf[1] = player.wheat
+        buf[2] = player.total_workers
+        buf[3] = player.available_workers
+        buf[4] = player.get_vp()
 
         # === Resources (5) ===
-        flat_state.extend(resources)
+        buf[_OFF_RESOURCES:_OFF_MULTIPLIERS] = player.resources[2:]
 
         # === Multipliers (4) ===
-        flat_state.extend(multipliers)
+        buf[_OFF_MULTIPLIERS:_OFF_TOOLS] = multipliers[1:]
 
         # === Tools (8) ===
         # Each tool slot: [value, availability_as_0_or_1]
-        for tool in tools:
-            flat_state.append(tool[0])
-            flat_state.append(1 if tool[1] else 0)
+        buf[_OFF_TOOLS:_OFF_ONE_USE] = (tools[0][0], tools[0][1], tools[1][0], tools[1][1],
+                                        tools[2][0], tools[2][1], tools[3][0], tools[3][1])
 
         # === One-use tools (3) ===
-        # Pad with zeros if fewer than 4
-        MAX_ONE_USE_TOOLS = 3
-        for i in range(MAX_ONE_USE_TOOLS):
-            flat_state.append(one_use_tools[i] if i < len(one_use_tools) else 0)
+        # Zero-padded when the player has fewer
+        _write_padded(buf, _OFF_ONE_USE, MAX_ONE_USE_TOOLS, player.one_use_tools)
 
         # === Card Drawings (16) ===
         # Track cards in two decks (8 slots each)
-        MAX_DECK_0_CARDS = 8
-        MAX_DECK_1_CARDS = 8
-
-        # Deck 0 cards
-        for i in range(MAX_DECK_0_CARDS):
-            flat_state.append(drawings[0][i] if i < len(drawings[0]) else 0)
-
-        # Deck 1 cards
-        for i in range(MAX_DECK_1_CARDS):
-            flat_state.append(drawings[1][i] if i < len(drawings[1]) else 0)
+        _write_padded(buf, _OFF_DRAWINGS, MAX_DECK_CARDS, drawings[0])
+        _write_padded(buf, _OFF_DRAWINGS + MAX_DECK_CARDS, MAX_DECK_CARDS, drawings[1])
 
         # === Board state (16 locations × 4 players = 64) ===
         # Track worker count for each player at each location
-        for area in self.locations:
-            if area is not None:
-                flat_state.extend(area.occupants.values())
-            else:
-                # Null location: 0 workers from each player
-                flat_state.extend([0, 0, 0, 0])
+        # (null locations read the board's always-empty row)
+        self.board.occupancy_into(buf[_OFF_BOARD:_OFF_DECK_SIZES], self._loc_rows)
 
         # === Building deck sizes (4) ===
-        for deck in self.buildings_in_deck.values():
-            flat_state.append(len(deck))
+        buf[_OFF_DECK_SIZES:_OFF_BUILDINGS] = self.buildings_in_deck.remaining_counts()
 
         # === Buildings (4 × 3 = 12) ===
         # Encode building requirements
+        off = _OFF_BUILDINGS
+        # (Building._state_tuple: flex [count, variety, 0], else the resources)
         for building in self.buildings:
-            if building is None:
-                flat_state.extend([0, 0, 0])
-            elif isinstance(building, FlexBuilding):
-                flat_state.extend([building.resources_require_count, building.variety, 0])
-            else:
-                flat_state.extend(building.resources)
+            buf[off:off + 3] = _ZERO_BUILDING if building is None else building._state_tuple
+            off += 3
 
         # === Cards (4 × 5 = 20) ===
         # Include deck size + 4 cards × 5 features
-        flat_state.append(len(self.cards_in_deck))
+        buf[_OFF_CARDS] = len(self.cards_in_deck)
+        off = _OFF_CARDS + 1
         for card in self.cards:
-            if card is None:
-                flat_state.extend([0, 0, 0, 0, 0])
-            else:
-                # Extract card data
-                card_data = list(card.data.values())
-                if card.data:
-                    if len(card_data) != 2:
-                        card_data.append(0)
-                else:
-                    card_data = [0,0]
-                
-                flat_state.extend([
-                    card.card_type_num,
-                    card.cost,
-                    card.painting or 0
-                ])
-                flat_state.extend(card_data)
+            buf[off:off + 5] = _ZERO_CARD if card is None else card._state_tuple
+            off += 5
 
         # === Action encoding (5) ===
-        flat_state.append(self.current_type_of_action)
-        flat_state.extend(self.current_action_data)
+        buf[_OFF_ACTION] = self.current_type_of_action
+        buf[_OFF_ACTION + 1:STATE_SIZE] = self.current_action_data
 
-        # === Total (146) ===
-        return np.array(flat_state, dtype=np.float32)
+        # === Total (147) ===
+        # Callers keep states across steps, so hand out a copy of the buffer
+        return buf.copy()
 
     def play_step(self, action_index: int):
+        # Whatever the action does, cached masks no longer apply
+        self.state_version += 1
 
-        action = self.action_system.get_action(action_index)
+        # Plain ints from here on so numpy scalars don't leak into player state
+        action = self.action_system.get_action(action_index).tolist()
 
         player_active = self.current_player
         current_score = self.current_player.get_score()
         current_vp = self.current_player.get_vp()
         if self.current_type_of_action == 1:
-            self.locations[action[0]].place(self.current_player_idx, action[1])
-            self.current_player.available_workers -= action[1]
+            self.place_worker(action[0], action[1])
             if not self.round_not_over():
                 self.current_player_idx = self.first_player
                 self.resolve_locations()
@@ -803,18 +990,22 @@ class Game:
             self.resolve_gathering(action)
             self.resolve_locations()
         elif self.current_type_of_action == 3:
-            location = self.locations[self.current_action_data[0]]
-            can_afford = location.is_able_to_buy(self.current_player.resources)
-            choice = "BUY" if action[0] == 1 else "SKIP"
-            resources = {k: v for k, v in self.current_player.resources.items() if k != 2}
-            print(f"  Buy/Skip: {choice}, can_afford={can_afford}, resources={resources}")
+            if _LOG:
+                location = self.locations[self.current_action_data[0]]
+                if location.kind_code == KIND_CARD:
+                    can_afford = location.is_able_to_buy(self.current_player.non_food_total)
+                else:
+                    can_afford = location.is_able_to_buy(self.current_player.resources)
+                choice = "BUY" if action[0] == 1 else "SKIP"
+                resources = dict(zip((3, 4, 5, 6), self.current_player.resources[3:]))
+                print(f"  Buy/Skip: {choice}, can_afford={can_afford}, resources={resources}")
             if action[0] == 1:  # Buy
                 location = self.locations[self.current_action_data[0]]
-                if isinstance(location, CertainBuilding):
-                    self.buy_building(self.current_action_data[0], location.resources)
+                if location.kind_code == KIND_CERTAIN_BUILDING:
+                    self.buy_building(self.current_action_data[0], location.vp)
                     self.resolve_locations()
-                elif isinstance(location, Card):
-                    self.buy_card(location)
+                elif location.kind_code == KIND_CARD:
+                    self.buy_card(self.current_action_data[0])
                     self.apply_card_effect(location)
                     self.resolve_locations()
                 else:  # FlexBuilding
@@ -824,13 +1015,13 @@ class Game:
                 self.resolve_locations()
         elif self.current_type_of_action == 4:
             location = self.locations[self.current_action_data[0]]
-            if isinstance(location, Card):
-                self.buy_card(location)
+            if location.kind_code == KIND_CARD:
+                self.buy_card(self.current_action_data[0])
                 self.apply_card_effect(location)
                 self.current_action_data = [0,0,0,0]
                 self.resolve_locations()
             else:
-                self.buy_building(self.current_action_data[0], action)
+                self.buy_building(self.current_action_data[0], sum(action))
                 self.current_action_data = [0,0,0,0]
                 self.resolve_locations()
         elif self.current_type_of_action == 5:
@@ -895,7 +1086,9 @@ class Game:
         if self.game_end:
             final_vp = current_score[3]
 
-            res = sum(r for r in current_score[0])
+            # Resources used to be a dict and this summed its keys (types
+            # 2-6), not the amounts; kept as is so the reward doesn't change
+            res = sum(range(2, 7))
 
             # Tiered bonuses for good scores
             if final_vp >= 0:
@@ -914,7 +1107,7 @@ class Game:
 
 
     def check_if_any_uncollectedhumans_left(self):
-        return any(loc.is_occupied(self.current_player_idx) for loc in self.locations if loc is not None)
+        return bool(self.board.occupied_by(self._loc_rows, self.current_player_idx).any())
     # TODO: Implement missing methods
     # - reset(): Reset game state for next episode
     # - get_random_legal_action(): Better random move selection
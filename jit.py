@@ -0,0 +1,63 @@
+"""
+Optional Numba support for Stone Age RL.
+
+Numba is not a hard dependency. When it is installed, kernels decorated with
+njit are compiled to machine code (and cached on disk with cache=True).
+Without it, njit is a no-op decorator and the kernels run as plain Python,
+so the game behaves the same either way - just slower.
+
+Usage:
+    from jit import njit
+
+    @njit(cache=True)
+    def kernel(...):
+        ...
+
+Every kernel uses cache=True, so compiled code is reused across processes.
+The first call in a process still has to load (or compile) it; warmup()
+does that up front and is called once at training startup.
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Fallback for numba.njit that returns the function unchanged."""
+        # Support both @njit and @njit(cache=True, ...)
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func):
+            return func
+        return decorator
+
+
+def warmup() -> None:
+    """
+    Call every Numba kernel once with dummy data of the real argument types.
+    
+    Loads the cached machine code (compiling it on the very first run), so
+    the first game step doesn't pay for it. Does nothing without Numba.
+    """
+    if not NUMBA_AVAILABLE:
+        return
+
+    # Imported here: those modules import njit from this one
+    import numpy as np
+    from action_system import _fill_mask_tools, fill_resource_mask
+    from area import _gather_rows
+    from game import _enumerate_spends
+
+    mask = np.zeros(8, dtype=np.int8)
+    _fill_mask_tools(mask, np.full(128, -1, dtype=np.int32),
+                     np.zeros(1, dtype=np.int64))
+    fill_resource_mask(mask, np.full((8, 8, 8, 8), -1, dtype=np.int32),
+                       0, 0, 0, 0, 1, 1, -1)
+
+    _gather_rows(np.zeros(4, dtype=np.float32), np.zeros((1, 4), dtype=np.int16),
+                 np.zeros(1, dtype=np.intp))
+
+    _enumerate_spends(0, 0, 0, 0, 1, -1)
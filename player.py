@@ -30,14 +30,18 @@ class Player:
         vp (int): Direct victory points.
         vp_buildings (int): Victory points from purchased buildings.
         AI (bool): Whether this is an AI player or human player.
-        resources (dict[int, int]): Resource inventory by type.
-                                   Keys: 2=food, 3=wood, 4=stone, 5=clay, 6=gold.
+        resources (list[int]): Resource inventory indexed by type:
+                               2=food, 3=wood, 4=stone, 5=clay, 6=gold
+                               (slots 0 and 1 are unused, always 0).
+        non_food_total (int): Running total of wood, stone, clay and gold,
+                              kept in sync by the resource methods below.
         tools (list[list]): Persistent tools. Each tool is [value, available].
         building_num (int): Number of buildings owned.
         one_use_tools (list[int]): Single-use tools with their values.
         card_effects (dict[int, list[int]]): Cards by collection.
                                             0=painting deck, 1=other deck.
-        multipliers (dict[str, int]): End-game scoring multipliers.
+        multipliers (list[int]): End-game scoring multipliers, indexed by
+                                 track (1-4); slot 0 is unused.
     """
     
     def __init__(self, food: int = 10, workers: int = 5, AI: bool = False) -> None:
@@ -55,14 +59,19 @@ class Player:
         self.vp = 0  # Victory points
         self.vp_buildings = 0  # Victory points from buildings
         
-        # Resource inventory: food, wood, stone, clay, gold
-        self.resources = {
-            2: food,  # Food (starting resource)
-            3: 0,     # Wood
-            4: 0,     # Stone
-            5: 0,     # Clay
-            6: 0,     # Gold
-        }
+        # Resource inventory indexed by resource type, so resources[3] is wood.
+        # Fixed slots: resources[3:] are the non-food resources, no filtering
+        self.resources = [
+            0, 0,     # Unused (types start at 2)
+            food,     # 2: Food (starting resource)
+            0,        # 3: Wood
+            0,        # 4: Stone
+            0,        # 5: Clay
+            0,        # 6: Gold
+        ]
+        # Everything but food; only change resources through the methods
+        # below so this stays in sync
+        self.non_food_total = 0
         
         # Persistent tools: [value, is_available]
         # Each element is [current_tool_value, whether_tool_can_be_used]
@@ -85,12 +94,14 @@ class Player:
         }
         
         # End-game scoring multipliers
-        self.multipliers: dict[int, int] = {
-            1: 0,      # VP per tool value
-            2: 0,  # VP per building owned
-            3: 0,    # VP per worker
-            4: 0,      # VP per wheat
-        }
+        # Fixed slots indexed by track, like resources: no dict lookups
+        self.multipliers: list[int] = [
+            0,      # (unused)
+            0,      # VP per tool value
+            0,      # VP per building owned
+            0,      # VP per worker
+            0,      # VP per wheat
+        ]
 
 
     def get_resource_with_die(self, resource_type: int, dice_roll: int, tools: list[int]) -> None:
@@ -110,6 +121,8 @@ class Player:
         # Calculate gained amount: dice value / resource type (easier with higher dice)
         gained = (dice_roll + tools_used) // resource_type
         self.resources[resource_type] += gained
+        if resource_type != 2:
+            self.non_food_total += gained
         
     def use_tool(self, tools):
         used_tools_sum = 0
@@ -153,6 +166,8 @@ class Player:
             amount (int): Quantity to add (default: 1).
         """
         self.resources[type] += amount
+        if type != 2:
+            self.non_food_total += amount
 
     def lose_resources(self, resources: list[int]) -> None:
         """
@@ -166,6 +181,8 @@ class Player:
         """
         for resource in resources:
             self.resources[resource] -= 1
+            if resource != 2:
+                self.non_food_total -= 1
 
     def get_tool(self) -> None:
         """
@@ -180,8 +197,9 @@ class Player:
             if self.tools[i][0] < self.tools[min_tool][0]:
                 min_tool = i
         
-        # Upgrade that slot
-        if sum(v[0] for v in self.tools)<16:
+        # Upgrade that slot (4 fixed slots: index them directly, no generator)
+        tools = self.tools
+        if tools[0][0] + tools[1][0] + tools[2][0] + tools[3][0] < 16:
             self.tools[min_tool][0] += 1
 
     def get_one_use_tool(self, tool_value: int) -> None:
@@ -258,10 +276,11 @@ class Player:
         Returns:
             int: Total victory points.
         """
+        tools = self.tools
         vp = (
             self.vp
             + self.vp_buildings
-            + self.multipliers[1] * sum(v[0] for v in self.tools)
+            + self.multipliers[1] * (tools[0][0] + tools[1][0] + tools[2][0] + tools[3][0])
             + self.multipliers[2] * self.building_num
             + self.multipliers[3] * self.total_workers
             + self.multipliers[4] * self.wheat
@@ -276,7 +295,7 @@ class Player:
         return vp
     
     def get_score(self) -> list[int]:
-        return [self.resources, self.wheat, self.total_workers, self.get_vp(), self.tools, sum(v for v in self.one_use_tools), self.multipliers.values()]
+        return [self.resources, self.wheat, self.total_workers, self.get_vp(), self.tools, sum(self.one_use_tools), self.multipliers[1:]]
 
     def feed(self) -> None:
         food_available = self.resources[2]
@@ -9,7 +9,10 @@ Classes:
     Utility: Special board locations with generic functionality.
 """
 
-from area import Area
+from area import Area, KIND_FARM, KIND_HOUSE, KIND_TOOLSHOP
+
+# Kind code by utility name
+UTILITY_KINDS = {"Farm": KIND_FARM, "House": KIND_HOUSE, "ToolShop": KIND_TOOLSHOP}
 
 
 class Utility(Area):
@@ -25,8 +28,12 @@ class Utility(Area):
     Attributes:
         n (str): Custom name of this utility (e.g., "Farm", "House", "ToolShop").
         capacity (int): Maximum workers that can be placed here (inherited).
-        occupants (dict[int, int]): Worker placement by player (inherited).
+        occupants (np.ndarray): Worker placement by player (inherited).
+        kind_code (int): KIND_FARM, KIND_HOUSE or KIND_TOOLSHOP, from the name
+                         (-1 for any other name).
     """
+
+    __slots__ = ("n", "kind_code")
     
     def __init__(self, name: str, capacity: int) -> None:
         """
@@ -42,6 +49,7 @@ class Utility(Area):
             - ToolShop: typically 1 (limited spots)
         """
         self.n = name
+        self.kind_code = UTILITY_KINDS.get(name, Area.kind_code)
         super().__init__(capacity)
 
     def name(self) -> str: